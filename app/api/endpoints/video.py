@@ -1,16 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.db.models import Video, VideoStatus
-from app.services.scraper import WebsiteScraper
-from app.services.video_generator import VideoGenerator
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.file_response import RangeFileResponse
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import SessionLocal, get_db
+from app.db.models import FINAL_STATUSES, Batch, Video, VideoStatus
+from app.services.job_queue import QueueFullError, get_job_queue
+from app.services.progress import get_progress_hub
+from app.services.render_profiles import RENDER_PROFILES
+from app.services.scheduler import domain_of
+from app.services.scrape_cache import normalize_url
+from app.services.status_writer import get_status_writer
+from app.services.video_jobs import run_video_job
+from datetime import datetime, timezone
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
+# Rendered files never change once a video is complete; ETags catch re-renders
+MEDIA_CACHE_CONTROL = "public, max-age=86400"
+# Seconds between comment lines that keep idle event streams open through proxies
+EVENTS_KEEPALIVE = 15
+
 class VideoRequest(BaseModel):
     website_url: str
+    force_refresh: bool = False
+    # Render profile name: 'preview', 'standard' or 'final'; defaults to RENDER_PROFILE
+    profile: Optional[str] = None
+    # Run the job under cProfile; ignored unless ALLOW_PROFILING is set
+    profile_job: bool = False
 
 class VideoResponse(BaseModel):
     id: int
@@ -18,48 +42,243 @@ class VideoResponse(BaseModel):
     status: str
     output_path: Optional[str] = None
     error_message: Optional[str] = None
+    peak_memory_mb: Optional[int] = None
+    progress: Optional[float] = None
+
+class BatchRequest(BaseModel):
+    urls: List[str]
+    force_refresh: bool = False
+    profile: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    id: int
+    total: int
+    # Submitted URLs dropped because they normalize to one already in the batch
+    duplicates: int = 0
+    counts: Dict[str, int]
+    progress: float
+    elapsed_seconds: float
+    videos_per_minute: float
+    videos: List[VideoResponse]
+
+def _check_profile(profile: Optional[str]):
+    if profile and profile not in RENDER_PROFILES:
+        raise HTTPException(status_code=422, detail=f"Unknown render profile: {profile}")
+
+@router.post("/", response_model=VideoResponse, status_code=202)
+@metrics.profiled
+async def create_video(request: VideoRequest, db: AsyncSession = Depends(get_db)):
+    _check_profile(request.profile)
+    queue = get_job_queue()
+    if queue.is_full():
+        raise HTTPException(status_code=429, detail="Video queue is full, try again later")
 
-@router.post("/", response_model=VideoResponse)
-async def create_video(request: VideoRequest, db: Session = Depends(get_db)):
     # Create video record
-    video = Video(website_url=request.website_url)
+    video = Video(website_url=request.website_url, status=VideoStatus.QUEUED)
     db.add(video)
-    db.commit()
-    db.refresh(video)
-    
-    # Start video generation process
+    await db.commit()
+
+    # Hand scraping and rendering to the worker pool
     try:
-        # Initialize services
-        scraper = WebsiteScraper()
-        video_generator = VideoGenerator()
-        
-        # Update status to processing
-        video.status = VideoStatus.PROCESSING
-        db.commit()
-        
-        # Scrape website content
-        content = scraper.scrape(request.website_url)
-        
-        # Generate video
-        output_path = video_generator.generate(content)
-        
-        # Update video record with success
-        video.status = VideoStatus.COMPLETED
-        video.output_path = output_path
-        db.commit()
-        
-    except Exception as e:
-        # Update video record with error
+        queue.submit(video.id, run_video_job, request.website_url, request.force_refresh, request.profile,
+                     request.profile_job, domain=domain_of(request.website_url))
+    except QueueFullError as e:
         video.status = VideoStatus.FAILED
         video.error_message = str(e)
-        db.commit()
-        raise HTTPException(status_code=500, detail=str(e))
-    
+        await db.commit()
+        raise HTTPException(status_code=429, detail=str(e))
+
     return video
 
+@router.post("/batch", response_model=BatchResponse, status_code=202)
+@metrics.profiled
+async def create_batch(request: BatchRequest, db: AsyncSession = Depends(get_db)):
+    _check_profile(request.profile)
+    # Keep the first spelling of each URL, dropping ones that normalize to the same page
+    urls = {}
+    for url in request.urls:
+        if url.strip():
+            urls.setdefault(normalize_url(url), url.strip())
+    if not urls:
+        raise HTTPException(status_code=422, detail="No URLs given")
+    if len(urls) > settings.batch_max_urls:
+        raise HTTPException(status_code=422, detail=f"At most {settings.batch_max_urls} URLs per batch")
+
+    queue = get_job_queue()
+    if not queue.has_room(len(urls)):
+        raise HTTPException(status_code=429, detail="Video queue is full, try again later")
+
+    # One transaction for the batch and all of its videos
+    batch = Batch()
+    db.add(batch)
+    await db.flush()
+    videos = [Video(website_url=url, status=VideoStatus.QUEUED, batch_id=batch.id) for url in urls.values()]
+    db.add_all(videos)
+    await db.commit()
+
+    # Batch jobs run at bulk priority, round-robin across domains, on workers
+    # whose browser pool stays warm from one job to the next
+    try:
+        queue.submit_bulk([
+            (video.id, run_video_job, (video.website_url, request.force_refresh, request.profile),
+             domain_of(video.website_url))
+            for video in videos
+        ])
+    except QueueFullError as e:
+        for video in videos:
+            video.status = VideoStatus.FAILED
+            video.error_message = str(e)
+        await db.commit()
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return _batch_summary(batch, videos, duplicates=len(request.urls) - len(urls))
+
+@router.get("/batch/{batch_id}", response_model=BatchResponse)
+@metrics.profiled
+async def get_batch(batch_id: int, db: AsyncSession = Depends(get_db)):
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    videos = (await db.execute(select(Video).where(Video.batch_id == batch_id).order_by(Video.id))).scalars().all()
+    return _batch_summary(batch, videos)
+
+def _batch_summary(batch: Batch, videos: list, duplicates: int = 0) -> dict:
+    """Aggregate progress and throughput of a batch"""
+    counts = {status.value: 0 for status in VideoStatus}
+    for video in videos:
+        counts[video.status.value] += 1
+    finished = [video for video in videos if video.status in FINAL_STATUSES]
+
+    # Timestamps are naive UTC; a finished batch stops its clock at the last update
+    if videos and len(finished) == len(videos):
+        end = max(video.updated_at for video in finished)
+    else:
+        end = datetime.now(timezone.utc).replace(tzinfo=None)
+    elapsed = max((end - batch.created_at).total_seconds(), 0.0)
+
+    return {
+        'id': batch.id,
+        'total': len(videos),
+        'duplicates': duplicates,
+        'counts': counts,
+        'progress': round(len(finished) / len(videos), 4) if videos else 0.0,
+        'elapsed_seconds': round(elapsed, 1),
+        'videos_per_minute': round(counts[VideoStatus.COMPLETED.value] / (elapsed / 60), 2) if elapsed else 0.0,
+        'videos': videos,
+    }
+
 @router.get("/{video_id}", response_model=VideoResponse)
-async def get_video(video_id: int, db: Session = Depends(get_db)):
-    video = db.query(Video).filter(Video.id == video_id).first()
+@metrics.profiled
+async def get_video(video_id: int, db: AsyncSession = Depends(get_db)):
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    return video
\ No newline at end of file
+    return video
+
+@router.post("/{video_id}/cancel", response_model=VideoResponse)
+async def cancel_video(video_id: int, db: AsyncSession = Depends(get_db)):
+    video = await db.get(Video, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    if video.status in FINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Video is already {video.status.value}")
+    cancelled = get_job_queue().cancel(video.id)
+    # A queued job is cancelled right away; write that now rather than on the next flush
+    await get_status_writer().flush()
+    if not cancelled:
+        # Not a job this process knows about (e.g. left over from before a restart),
+        # unless it ended just now and its final status is already written
+        await db.execute(
+            update(Video)
+            .where(Video.id == video.id, Video.status.not_in(FINAL_STATUSES))
+            .values(status=VideoStatus.CANCELLED)
+        )
+        await db.commit()
+    await db.refresh(video)
+    return video
+
+async def _completed_video(db: AsyncSession, video_id: int) -> Video:
+    video = await db.get(Video, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    if video.status != VideoStatus.COMPLETED or not video.output_path:
+        raise HTTPException(status_code=409, detail=f"Video is {video.status.value}, not completed")
+    return video
+
+@router.api_route("/{video_id}/file", methods=["GET", "HEAD"])
+async def get_video_file(video_id: int, db: AsyncSession = Depends(get_db)):
+    """The rendered MP4, with Range and conditional request support"""
+    video = await _completed_video(db, video_id)
+    if not os.path.isfile(video.output_path):
+        raise HTTPException(status_code=404, detail="Video file is no longer available")
+    return RangeFileResponse(video.output_path, media_type="video/mp4",
+                             filename=f"video_{video.id}.mp4", cache_control=MEDIA_CACHE_CONTROL)
+
+@router.api_route("/{video_id}/poster", methods=["GET", "HEAD"])
+async def get_video_poster(video_id: int, db: AsyncSession = Depends(get_db)):
+    """A JPEG still of the video, taken from a frame composited during rendering"""
+    from app.services.video_generator import poster_path
+    video = await _completed_video(db, video_id)
+    path = poster_path(video.output_path)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Video has no poster")
+    return RangeFileResponse(path, media_type="image/jpeg", cache_control=MEDIA_CACHE_CONTROL)
+
+async def _video_state(video_id: int) -> Optional[dict]:
+    async with SessionLocal() as db:
+        video = await db.get(Video, video_id)
+        if video is None:
+            return None
+        return {
+            'id': video.id,
+            'status': video.status.value,
+            'output_path': video.output_path,
+            'error_message': video.error_message,
+            'peak_memory_mb': video.peak_memory_mb,
+            'progress': video.progress,
+        }
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.get("/{video_id}/events")
+async def video_events(video_id: int):
+    """Server-Sent Events: the job's current state, then each status change and encode progress update.
+
+    ``status`` events carry the job's state; ``progress`` events carry frames,
+    total_frames, progress and eta_seconds while rendering. The stream ends when the
+    job completes, fails or is cancelled.
+    """
+    hub = get_progress_hub()
+    # Subscribe before reading the state, so no event in between is missed
+    subscription = hub.subscribe(video_id)
+    state = hub.snapshot(video_id)
+    if state is None:
+        loaded = await _video_state(video_id)
+        if loaded is None:
+            hub.unsubscribe(subscription)
+            raise HTTPException(status_code=404, detail="Video not found")
+        state = hub.seed(video_id, loaded)
+
+    final = {status.value for status in FINAL_STATUSES}
+
+    async def stream():
+        try:
+            yield _sse('status', state)
+            status = state['status']
+            while status not in final:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if 'status' in event:
+                    status = event['status']
+                    yield _sse('status', event)
+                else:
+                    yield _sse('progress', event)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,128 @@
+# app/api/file_response.py
+
+from email.utils import formatdate
+from starlette.datastructures import Headers
+from starlette.responses import Response
+import anyio
+import os
+import re
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFileResponse(Response):
+    """Sends a file with support for Range, If-Range and If-None-Match.
+
+    Where the server offers the ASGI zero-copy send extension, the kernel
+    copies the bytes straight from the file to the socket (sendfile).
+    Elsewhere the file is streamed in ``chunk_size`` pieces, read off the
+    event loop, so memory use does not depend on the file size.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: str, media_type: str, filename: str = None, cache_control: str = None):
+        self.path = path
+        self.stat_result = os.stat(path)
+        self.media_type = media_type
+        self.status_code = 200
+        self.background = None
+        headers = {
+            'accept-ranges': 'bytes',
+            'etag': self.etag,
+            'last-modified': formatdate(self.stat_result.st_mtime, usegmt=True),
+        }
+        if filename:
+            headers['content-disposition'] = f'inline; filename="{filename}"'
+        if cache_control:
+            headers['cache-control'] = cache_control
+        self.init_headers(headers)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.stat_result.st_size:x}-{self.stat_result.st_mtime_ns:x}"'
+
+    def _not_modified(self, request_headers: Headers) -> bool:
+        if_none_match = request_headers.get('if-none-match')
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or self.etag in tags
+
+    def _byte_range(self, request_headers: Headers):
+        """``(start, end)`` inclusive for a usable single Range header, None to send the whole file.
+
+        Raises ValueError when the range cannot be satisfied. Malformed and
+        multi-part ranges are ignored, which HTTP allows.
+        """
+        header = request_headers.get('range')
+        if not header:
+            return None
+        if_range = request_headers.get('if-range')
+        if if_range and if_range != self.etag:
+            return None
+        match = RANGE_RE.match(header.strip())
+        if not match or match.groups() == ('', ''):
+            return None
+        size = self.stat_result.st_size
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        else:
+            # A suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+        if start >= size or size == 0:
+            raise ValueError(header)
+        return start, end
+
+    async def __call__(self, scope, receive, send):
+        request_headers = Headers(scope=scope)
+        size = self.stat_result.st_size
+
+        if self._not_modified(request_headers):
+            headers = [(name, value) for name, value in self.raw_headers
+                       if name in (b'etag', b'last-modified', b'cache-control')]
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        try:
+            byte_range = self._byte_range(request_headers)
+        except ValueError:
+            await send({'type': 'http.response.start', 'status': 416,
+                        'headers': [(b'content-range', f"bytes */{size}".encode())]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        if byte_range is None:
+            status, start, end = 200, 0, size - 1
+        else:
+            status, (start, end) = 206, byte_range
+            self.headers['content-range'] = f"bytes {start}-{end}/{size}"
+        count = end - start + 1
+        self.headers['content-length'] = str(count)
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': self.raw_headers})
+        if scope['method'] == 'HEAD' or count == 0:
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        with open(self.path, 'rb') as f:
+            if 'http.response.zerocopysend' in scope.get('extensions', {}):
+                await send({'type': 'http.response.zerocopysend', 'file': f, 'offset': start, 'count': count})
+                return
+            offset = start
+            while offset <= end:
+                length = min(self.chunk_size, end + 1 - offset)
+                chunk = await anyio.to_thread.run_sync(os.pread, f.fileno(), length, offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': offset <= end})
+            if offset <= end:
+                # The file shrank while it was being sent
+                await send({'type': 'http.response.body', 'body': b''})
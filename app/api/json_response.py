@@ -0,0 +1,21 @@
+# app/api/json_response.py
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serialized with orjson when it is installed.
+
+    Return it from a handler whose result is already plain JSON data; that
+    also skips FastAPI's jsonable_encoder pass over the whole payload.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,96 @@
+# app/core/config.py
+
+import json
+import os
+
+
+class Settings:
+    """Runtime settings, read once from the environment"""
+
+    def __init__(self):
+        # Browser pool
+        self.driver_pool_size = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+        self.driver_max_uses = int(os.getenv("DRIVER_MAX_USES", "50"))
+        self.driver_acquire_timeout = float(os.getenv("DRIVER_ACQUIRE_TIMEOUT", "60"))
+
+        # Scrape mode: 'auto', 'http' or 'browser'
+        self.scrape_mode = os.getenv("SCRAPE_MODE", "auto")
+
+        # Page readiness: per-check timeout, overall budget, and {host: css selector}
+        self.readiness_timeout = float(os.getenv("READINESS_TIMEOUT", "8"))
+        self.readiness_budget = float(os.getenv("READINESS_BUDGET", "15"))
+        # Longest wait for the DOM to settle once the network is idle
+        self.readiness_quiet_max_wait = float(os.getenv("READINESS_QUIET_MAX_WAIT", "2"))
+        self.readiness_selectors = json.loads(os.getenv("READINESS_SELECTORS", "{}"))
+
+        # Content extraction: 'lxml' single pass, or 'soup' for the reference extractors
+        self.extraction_engine = os.getenv("EXTRACTION_ENGINE", "lxml")
+
+        # Scrape cache
+        self.scrape_cache_dir = os.getenv("SCRAPE_CACHE_DIR", os.path.join("cache", "scrape"))
+        self.scrape_cache_ttl = float(os.getenv("SCRAPE_CACHE_TTL", "3600"))
+
+        # Compact scrape responses: longest text kept, and sections per page
+        self.payload_max_text = int(os.getenv("PAYLOAD_MAX_TEXT", "500"))
+        self.payload_section_limit = int(os.getenv("PAYLOAD_SECTION_LIMIT", "50"))
+
+        # Image assets: downloads per job, concurrency, per-image limits and thumbnail cache size
+        self.asset_cache_dir = os.getenv("ASSET_CACHE_DIR", os.path.join("cache", "assets"))
+        self.asset_concurrency = int(os.getenv("ASSET_CONCURRENCY", "8"))
+        self.asset_max_count = int(os.getenv("ASSET_MAX_COUNT", "12"))
+        self.asset_max_bytes = int(os.getenv("ASSET_MAX_BYTES", str(5 * 1024 ** 2)))
+        self.asset_timeout = float(os.getenv("ASSET_TIMEOUT", "10"))
+        self.asset_cache_max_bytes = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(512 * 1024 ** 2)))
+
+        # Opt-in profiling (X-Profile header, per-job flag) and where .prof files go
+        self.allow_profiling = os.getenv("ALLOW_PROFILING", "0") == "1"
+        self.profile_dir = os.getenv("PROFILE_DIR", "profiles")
+
+        # Persistence: connection pool size and overflow (ignored for in-memory SQLite),
+        # and how long job status updates are coalesced before they are written
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./invideo.db")
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.status_flush_interval = float(os.getenv("STATUS_FLUSH_INTERVAL", "0.25"))
+
+        # Video jobs
+        self.job_backend = os.getenv("JOB_BACKEND", "local")
+        self.job_workers = int(os.getenv("JOB_WORKERS", "2"))
+        self.job_queue_size = int(os.getenv("JOB_QUEUE_SIZE", "16"))
+        self.job_backlog_size = int(os.getenv("JOB_BACKLOG_SIZE", "2000"))
+        self.batch_max_urls = int(os.getenv("BATCH_MAX_URLS", "500"))
+        # Start job workers at startup with the render modules imported, and a browser launched
+        self.worker_prewarm = os.getenv("WORKER_PREWARM", "1") == "1"
+        self.worker_prewarm_browser = os.getenv("WORKER_PREWARM_BROWSER", "1") == "1"
+
+        # Scrape scheduling: per-domain concurrency, start rate (per second) and burst,
+        # {domain: {"concurrency": n, "rate": r, "burst": b}} overrides, and global admission
+        self.domain_concurrency = int(os.getenv("DOMAIN_CONCURRENCY", "2"))
+        self.domain_rate = float(os.getenv("DOMAIN_RATE", "0.5"))
+        self.domain_burst = int(os.getenv("DOMAIN_BURST", "2"))
+        self.domain_limits = json.loads(os.getenv("DOMAIN_LIMITS", "{}"))
+        self.browser_slots = int(os.getenv("BROWSER_SLOTS", str(self.job_workers + self.driver_pool_size)))
+        # Longest an /api/scrape request waits for its domain's slot before a 429
+        self.scrape_slot_timeout = float(os.getenv("SCRAPE_SLOT_TIMEOUT", "30"))
+        self.min_free_memory_mb = int(os.getenv("MIN_FREE_MEMORY_MB", "512"))
+
+        # Rendering
+        self.render_mode = os.getenv("RENDER_MODE", "parallel")
+        # Default render profile ('preview', 'standard' or 'final'); 0 threads lets x264 decide
+        self.render_profile = os.getenv("RENDER_PROFILE", "standard")
+        self.encoder_threads = int(os.getenv("ENCODER_THREADS", "0"))
+        # Every job worker has its own render pool; by default they share the CPUs between them
+        default_render_workers = max(1, (os.cpu_count() or 1) // max(self.job_workers, 1))
+        self.render_workers = int(os.getenv("RENDER_WORKERS", str(default_render_workers)))
+
+        # Segment cache: encoded segments keyed by content, evicted least recently used
+        self.segment_cache_dir = os.getenv("SEGMENT_CACHE_DIR", os.path.join("cache", "segments"))
+        self.segment_cache_max_bytes = int(os.getenv("SEGMENT_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+        # Captions: 'pillow' renders text in-process, 'imagemagick' uses MoviePy's TextClip
+        self.text_renderer = os.getenv("TEXT_RENDERER", "pillow")
+        self.text_font = os.getenv("TEXT_FONT", "DejaVuSans.ttf")
+
+
+settings = Settings()
@@ -0,0 +1,216 @@
+# app/core/metrics.py
+
+from app.core.config import settings
+from contextlib import contextmanager
+import contextvars
+import cProfile
+import functools
+import inspect
+import os
+import threading
+import time
+
+# Seconds; covers everything from a cache lookup to a full render
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_registry = {}
+_lock = threading.Lock()
+# Observations made inside capture() are collected here instead of recorded
+_capture = contextvars.ContextVar('metrics_capture', default=None)
+# Set in worker processes: ships observations to the process that serves /metrics
+_forward = None
+
+
+def _label_values(names: tuple, labels: dict) -> tuple:
+    return tuple(str(labels.get(name, '')) for name in names)
+
+
+def _format_labels(names: tuple, values: tuple, le: str = None) -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        _registry[name] = self
+
+    def inc(self, amount: float = 1, **labels):
+        _observe(self.name, labels, amount)
+
+    def value(self, **labels) -> float:
+        """Current count for one set of labels, as recorded in this process"""
+        with _lock:
+            return self._values.get(_label_values(self.labels, labels), 0)
+
+    def _apply(self, labels: dict, amount: float):
+        key = _label_values(self.labels, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def _render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets"""
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}
+        _registry[name] = self
+
+    def observe(self, value: float, **labels):
+        _observe(self.name, labels, value)
+
+    def _apply(self, labels: dict, value: float):
+        key = _label_values(self.labels, labels)
+        state = self._values.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state['buckets'][index] += 1
+        state['sum'] += value
+        state['count'] += 1
+
+    def _render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, state in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, state['buckets']):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bound)} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, '+Inf')} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {round(state['sum'], 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {state['count']}")
+        return lines
+
+
+STAGE_SECONDS = Histogram('invideo_stage_seconds', 'Time spent in each pipeline stage', ('stage',))
+JOBS_TOTAL = Counter('invideo_jobs_total', 'Video jobs by final status', ('status',))
+SCRAPES_TOTAL = Counter('invideo_scrapes_total', 'Scrapes by how the page was fetched', ('mode',))
+SCRAPE_CACHE_TOTAL = Counter('invideo_scrape_cache_total', 'Scrape cache lookups by result', ('result',))
+SCRAPE_CACHE_BYTES_SAVED = Counter('invideo_scrape_cache_bytes_saved_total',
+                                   'Bytes of scrape results and screenshots served from the cache')
+SEGMENTS_TOTAL = Counter('invideo_segments_total', 'Video segments by segment cache result', ('cache',))
+
+
+def _observe(name: str, labels: dict, value: float):
+    captured = _capture.get()
+    if captured is not None:
+        captured.append((name, labels, value))
+    elif _forward is not None:
+        _forward((name, labels, value))
+    else:
+        record((name, labels, value))
+
+
+def record(observation: tuple):
+    """Apply an observation made elsewhere, e.g. in a worker process"""
+    name, labels, value = observation
+    metric = _registry.get(name)
+    if metric is None:
+        return
+    with _lock:
+        metric._apply(labels, value)
+
+
+def replay(observations: list):
+    """Observe again what a capture() block collected, in this process's context"""
+    for name, labels, value in observations:
+        _observe(name, labels, value)
+
+
+def set_forwarder(forward):
+    """Send this process's observations to ``forward`` instead of the local registry"""
+    global _forward
+    _forward = forward
+
+
+@contextmanager
+def capture():
+    """Collect observations made in the block into the yielded list"""
+    observations = []
+    token = _capture.set(observations)
+    try:
+        yield observations
+    finally:
+        _capture.reset(token)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block into invideo_stage_seconds, including when it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        for metric in _registry.values():
+            lines.extend(metric._render())
+    return '\n'.join(lines) + '\n'
+
+
+# Opt-in profiling. A request asks for it with the X-Profile header (if
+# ALLOW_PROFILING is set); the middleware puts a holder in this context var
+# and @profiled handlers fill it with the path of the stats file they wrote.
+profile_request = contextvars.ContextVar('profile_request', default=None)
+
+
+@contextmanager
+def profile(name: str):
+    """cProfile the block and dump the stats to PROFILE_DIR; yields the stats file path"""
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    path = os.path.join(settings.profile_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{name}.prof")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile written to {path}")
+
+
+def profiled(handler):
+    """Profile an endpoint when the request asked for it.
+
+    A sync handler is profiled in the thread it runs in. An async handler is
+    profiled on the event loop thread until it returns, which also counts
+    other requests' work done while it awaits.
+    """
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(*args, **kwargs):
+            holder = profile_request.get()
+            if holder is None:
+                return await handler(*args, **kwargs)
+            with profile(handler.__name__) as path:
+                holder['path'] = path
+                return await handler(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        holder = profile_request.get()
+        if holder is None:
+            return handler(*args, **kwargs)
+        with profile(handler.__name__) as path:
+            holder['path'] = path
+            return handler(*args, **kwargs)
+    return wrapper
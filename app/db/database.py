@@ -0,0 +1,78 @@
+# app/db/database.py
+
+from sqlalchemy import event, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from app.core.config import settings
+
+# Async drivers for the plain URLs DATABASE_URL is usually given as
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+
+def async_database_url(url: str):
+    """``url`` with its dialect's async driver, unless it already names a driver"""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url
+
+
+def _engine_options(url) -> dict:
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # One shared connection, or every session would see its own empty database
+        return {}
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+    if url.get_backend_name() != "sqlite":
+        options["pool_pre_ping"] = True
+    return options
+
+
+url = async_database_url(settings.database_url)
+engine = create_async_engine(url, **_engine_options(url))
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
+
+if url.get_backend_name() == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # WAL lets API reads proceed while status updates are written
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+async def init_db():
+    """Create tables and indexes for all registered models"""
+    from app.db import models  # noqa: F401
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def fail_interrupted_jobs(session_factory=None) -> int:
+    """Fail videos a previous run left unfinished; queued jobs only live in memory.
+
+    Returns the number of videos changed.
+    """
+    from app.db.models import FINAL_STATUSES, Video, VideoStatus
+    async with (session_factory or SessionLocal)() as db:
+        async with db.begin():
+            result = await db.execute(
+                update(Video)
+                .where(Video.status.not_in(FINAL_STATUSES))
+                .values(status=VideoStatus.FAILED, error_message="interrupted", progress=None)
+            )
+    return result.rowcount
@@ -0,0 +1,32 @@
+# app/db/models.py
+
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
+from app.db.database import Base
+from app.db.status import FINAL_STATUSES, VideoStatus
+
+
+class Batch(Base):
+    __tablename__ = "batches"
+    # Load server defaults with the INSERT; async sessions cannot lazy-load them later
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class Video(Base):
+    __tablename__ = "videos"
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True)
+    website_url = Column(String, nullable=False, index=True)
+    batch_id = Column(Integer, ForeignKey("batches.id"), nullable=True, index=True)
+    status = Column(Enum(VideoStatus), nullable=False, default=VideoStatus.QUEUED, index=True)
+    output_path = Column(String, nullable=True)
+    error_message = Column(Text, nullable=True)
+    # Peak resident memory of the worker process tree while the job ran
+    peak_memory_mb = Column(Integer, nullable=True)
+    # Fraction of frames encoded, while rendering
+    progress = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,16 @@
+# app/db/status.py
+
+import enum
+
+
+# Kept apart from the models so job workers can name statuses without loading SQLAlchemy
+class VideoStatus(str, enum.Enum):
+    QUEUED = "queued"
+    SCRAPING = "scraping"
+    RENDERING = "rendering"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINAL_STATUSES = {VideoStatus.COMPLETED, VideoStatus.FAILED, VideoStatus.CANCELLED}
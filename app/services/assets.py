@@ -0,0 +1,189 @@
+# app/services/assets.py
+
+from PIL import Image
+from PIL.Image import Resampling
+from app.core.config import settings
+from app.services.http_client import USER_AGENT
+from app.services.segment_cache import evict_lru
+import asyncio
+import hashlib
+import httpx
+import io
+import os
+import tempfile
+import threading
+import time
+
+
+class AssetTooLarge(Exception):
+    """Raised when an image is bigger than ASSET_MAX_BYTES"""
+
+
+class ThumbnailCache:
+    """Downscaled images on disk, keyed by a hash of the original bytes and the target size.
+
+    The same logo served from several URLs is decoded once. A small pointer
+    file per URL remembers which content it served, so repeat runs skip
+    the download entirely while the pointer is younger than ``ttl``.
+    Thumbnails are evicted least recently used first once they take more
+    than ``max_bytes``, and expired pointers go with them.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl: float = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or settings.asset_cache_dir
+        self.ttl = settings.scrape_cache_ttl if ttl is None else ttl
+        self.max_bytes = max_bytes or settings.asset_cache_max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.cache_dir, 'urls'), exist_ok=True)
+
+    def _thumbnail_path(self, digest: str, size: tuple) -> str:
+        return os.path.join(self.cache_dir, f"{digest}_{size[0]}x{size[1]}.png")
+
+    def _pointer_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, 'urls', hashlib.sha256(url.encode()).hexdigest())
+
+    def lookup(self, url: str, size: tuple) -> str:
+        """Thumbnail for a recently fetched URL, or None"""
+        pointer = self._pointer_path(url)
+        try:
+            if time.time() - os.path.getmtime(pointer) > self.ttl:
+                return None
+            with open(pointer) as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        path = self._thumbnail_path(digest, size)
+        try:
+            # Mark it recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, url: str, data: bytes, size: tuple) -> str:
+        """Downscale ``data`` to fit ``size`` unless that content is already cached"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._thumbnail_path(digest, size)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            self._write(path, self._downscale(data, size))
+            self.evict()
+        self._write(self._pointer_path(url), digest.encode())
+        return path
+
+    def evict(self):
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, '.png')
+            pointers_dir = os.path.join(self.cache_dir, 'urls')
+            expired = time.time() - self.ttl
+            for entry in os.scandir(pointers_dir):
+                try:
+                    if entry.stat().st_mtime < expired:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def _downscale(self, data: bytes, size: tuple) -> bytes:
+        img = Image.open(io.BytesIO(data))
+        # JPEGs decode straight at a reduced scale
+        img.draft('RGB', size)
+        img = img.convert('RGBA')
+        img.thumbnail(size, Resampling.LANCZOS)
+        output = io.BytesIO()
+        img.save(output, format='PNG', compress_level=1)
+        return output.getvalue()
+
+    def _write(self, path: str, data: bytes):
+        # Write then rename, so concurrent jobs never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class AssetFetcher:
+    """Downloads images concurrently over one pooled async client.
+
+    At most ``concurrency`` downloads run at once, each limited to
+    ``max_bytes`` and ``timeout`` seconds. Every image is decoded and
+    downscaled once, straight into the thumbnail cache.
+    """
+
+    def __init__(self, cache: ThumbnailCache = None, concurrency: int = None,
+                 max_bytes: int = None, timeout: float = None):
+        self.cache = cache or ThumbnailCache()
+        self.concurrency = concurrency or settings.asset_concurrency
+        self.max_bytes = max_bytes or settings.asset_max_bytes
+        self.timeout = timeout or settings.asset_timeout
+        self._lock = threading.Lock()
+        self._stats = {'cached': 0, 'fetched': 0, 'failed': 0, 'bytes': 0}
+
+    def fetch(self, urls: list, size: tuple) -> dict:
+        """Blocking wrapper around ``fetch_all`` for code without an event loop"""
+        return asyncio.run(self.fetch_all(urls, size))
+
+    async def fetch_all(self, urls: list, size: tuple) -> dict:
+        """Map each http(s) URL to a thumbnail path no larger than ``size``; failures are left out"""
+        urls = [url for url in dict.fromkeys(urls) if url and url.startswith(('http://', 'https://'))]
+        urls = urls[:settings.asset_max_count]
+        results = {}
+        todo = []
+        for url in urls:
+            path = self.cache.lookup(url, size)
+            if path:
+                results[url] = path
+                self._count('cached')
+            else:
+                todo.append(url)
+        if not todo:
+            return results
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(self.timeout, connect=5.0),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            headers={'User-Agent': USER_AGENT},
+        ) as client:
+            paths = await asyncio.gather(*(self._fetch_one(client, semaphore, url, size) for url in todo))
+        results.update((url, path) for url, path in zip(todo, paths) if path)
+        return results
+
+    async def _fetch_one(self, client, semaphore, url: str, size: tuple) -> str:
+        try:
+            async with semaphore:
+                data = await asyncio.wait_for(self._download(client, url), self.timeout)
+            # Decoding is CPU work; keep it off the event loop so downloads keep flowing
+            path = await asyncio.to_thread(self.cache.put, url, data, size)
+        except (httpx.HTTPError, asyncio.TimeoutError, AssetTooLarge, OSError, ValueError,
+                Image.DecompressionBombError) as e:
+            print(f"Skipping image {url}: {str(e) or type(e).__name__}")
+            self._count('failed')
+            return None
+        self._count('fetched', len(data))
+        return path
+
+    async def _download(self, client, url: str) -> bytes:
+        async with client.stream('GET', url) as response:
+            response.raise_for_status()
+            length = response.headers.get('content-length')
+            if length and length.isdigit() and int(length) > self.max_bytes:
+                raise AssetTooLarge(f"{length} bytes is over the {self.max_bytes} byte limit")
+            chunks = []
+            total = 0
+            async for chunk in response.aiter_bytes():
+                total += len(chunk)
+                if total > self.max_bytes:
+                    raise AssetTooLarge(f"more than {self.max_bytes} bytes")
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+    def _count(self, name: str, size: int = 0):
+        with self._lock:
+            self._stats[name] += 1
+            self._stats['bytes'] += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
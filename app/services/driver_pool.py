@@ -0,0 +1,215 @@
+# app/services/driver_pool.py
+
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+from functools import lru_cache
+from app.core import metrics
+from app.core.config import settings
+import atexit
+import threading
+import time
+
+
+@lru_cache(maxsize=1)
+def resolve_driver_path() -> str:
+    """Resolve the chromedriver binary once per process"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def build_chrome_options():
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--window-size=1920,1080")
+    return chrome_options
+
+
+class PooledDriver:
+    """A live Chrome session plus its bookkeeping"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.acquired_at = 0.0
+
+
+class DriverPool:
+    """Hands out warm headless Chrome drivers and recycles them between jobs"""
+
+    def __init__(self, size: int = None, max_uses: int = None, acquire_timeout: float = None):
+        self.size = size or settings.driver_pool_size
+        self.max_uses = max_uses or settings.driver_max_uses
+        self.acquire_timeout = acquire_timeout or settings.driver_acquire_timeout
+        self._cond = threading.Condition()
+        self._idle = []
+        self._live = 0
+        self._in_use = 0
+        self._closed = False
+        self._started_at = time.monotonic()
+        self._stats = {
+            'acquisitions': 0,
+            'launched': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'busy_time': 0.0,
+        }
+
+    def _launch(self):
+        # Selenium's webdriver package is only loaded once a browser is needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        service = Service(resolve_driver_path())
+        return webdriver.Chrome(service=service, options=build_chrome_options())
+
+    def acquire(self) -> PooledDriver:
+        """Take an idle driver, launching one if the pool is not full yet"""
+        start = time.monotonic()
+        entry = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = self.acquire_timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser available after {self.acquire_timeout:.0f}s")
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        if entry is None:
+            try:
+                entry = PooledDriver(self._launch())
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats['launched'] += 1
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._stats['acquisitions'] += 1
+            self._stats['total_wait'] += waited
+            self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+        entry.acquired_at = time.monotonic()
+        return entry
+
+    def release(self, entry: PooledDriver, broken: bool = False):
+        """Return a driver to the pool, retiring it if it is worn out or crashed"""
+        busy = time.monotonic() - entry.acquired_at
+        entry.uses += 1
+        crashed = broken
+        with self._cond:
+            closed = self._closed
+        retire = broken or closed or entry.uses >= self.max_uses
+        try:
+            if not retire:
+                try:
+                    self._reset(entry.driver)
+                except Exception:
+                    # A dead chromedriver surfaces as urllib3 connection errors, not WebDriverException
+                    crashed = retire = True
+            if retire:
+                self._quit(entry.driver)
+        finally:
+            with self._cond:
+                self._stats['busy_time'] += busy
+                self._in_use -= 1
+                if retire:
+                    self._live -= 1
+                    self._stats['crashed' if crashed else 'recycled'] += 1
+                else:
+                    self._idle.append(entry)
+                self._cond.notify()
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for the duration of the block"""
+        with metrics.span('scrape.driver_acquire'):
+            entry = self.acquire()
+        broken = False
+        try:
+            yield entry.driver
+        except Exception:
+            # Any failure may have left the browser in a bad state; retire it rather than reset it
+            broken = True
+            raise
+        finally:
+            self.release(entry, broken=broken)
+
+    def _reset(self, driver):
+        """Drop cookies, storage and extra tabs left behind by the previous job"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except WebDriverException:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            live, idle, in_use = self._live, len(self._idle), self._in_use
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        acquisitions = stats['acquisitions']
+        return {
+            'size': self.size,
+            'live': live,
+            'idle': idle,
+            'in_use': in_use,
+            'acquisitions': acquisitions,
+            'launched': stats['launched'],
+            'recycled': stats['recycled'],
+            'crashed': stats['crashed'],
+            'avg_wait_ms': round(1000 * stats['total_wait'] / acquisitions, 2) if acquisitions else 0.0,
+            'max_wait_ms': round(1000 * stats['max_wait'], 2),
+            'utilization': round(min(stats['busy_time'] / (elapsed * self.size), 1.0), 4),
+        }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._quit(entry.driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Process-wide shared pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
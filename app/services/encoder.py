@@ -0,0 +1,207 @@
+# app/services/encoder.py
+
+from moviepy.config import get_setting
+from PIL import Image
+import numpy as np
+import os
+import queue
+import subprocess
+import threading
+
+
+def ffmpeg_binary() -> str:
+    return get_setting("FFMPEG_BINARY")
+
+
+def _run_ffmpeg(args: list):
+    cmd = [ffmpeg_binary(), '-y', '-loglevel', 'error'] + args
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+
+
+def video_args(fps: int, codec: str, preset: str = None, crf: int = None, threads: int = None,
+               faststart: bool = False) -> list:
+    """Output options shared by every segment so they can be concatenated losslessly.
+
+    ``faststart`` moves the index (moov atom) to the front of the file, so
+    players can start before the download finishes; only final outputs need it.
+    """
+    args = ['-r', str(fps), '-c:v', codec, '-pix_fmt', 'yuv420p']
+    if preset:
+        args += ['-preset', preset]
+    if crf is not None:
+        args += ['-crf', str(crf)]
+    if threads is not None:
+        args += ['-threads', str(threads)]
+    if faststart:
+        args += ['-movflags', '+faststart']
+    return args
+
+
+class FrameSink:
+    """One ffmpeg process fed raw RGB frames through a fixed-size buffer.
+
+    ``write`` blocks once ``buffer_frames`` frames are waiting, so memory
+    stays bounded however long the video is. Frames are handed to the pipe
+    as-is; writing the same array again (a frame that did not change) costs
+    nothing beyond the pipe write. Arrays must not be modified after
+    they have been written.
+    """
+
+    def __init__(self, size: tuple, output_path: str, fps: int = 24, codec: str = 'libx264',
+                 buffer_frames: int = 8, **options):
+        width, height = size
+        self.frame_shape = (height, width, 3)
+        self.frames_written = 0
+        self.output_path = output_path
+        cmd = [
+            ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}",
+            '-framerate', str(fps), '-i', '-',
+        ] + video_args(fps, codec, **options) + [output_path]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                      stderr=subprocess.PIPE)
+        self._buffer = queue.Queue(maxsize=buffer_frames)
+        self._error = None
+        self._writer = threading.Thread(target=self._write_frames, name="frame-sink", daemon=True)
+        self._writer.start()
+
+    def write(self, frame, repeat: int = 1):
+        """Queue ``frame`` (an HxWx3 uint8 array) to be written ``repeat`` times"""
+        if self._error is not None:
+            # The encoder went away; close() reports ffmpeg's own error message
+            self.close()
+        if frame.dtype != np.uint8 or not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match sink shape {self.frame_shape}")
+        for _ in range(repeat):
+            self._buffer.put(frame)
+        self.frames_written += repeat
+
+    def close(self):
+        """Flush the buffer, finish the encode and raise if ffmpeg failed"""
+        self._buffer.put(None)
+        self._writer.join()
+        stderr = self._proc.stderr.read()
+        self._proc.wait()
+        if self._proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+        if self._error is not None:
+            raise self._error
+
+    def abort(self):
+        """Stop the encoder and delete whatever it wrote"""
+        self._proc.kill()
+        # Unblock the writer if it is waiting on a full pipe or an empty buffer
+        while self._writer.is_alive():
+            try:
+                self._buffer.put(None, timeout=0.1)
+            except queue.Full:
+                pass
+            self._writer.join(timeout=0.1)
+        self._proc.wait()
+        # Never leave a truncated file behind
+        _remove_partial(self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _write_frames(self):
+        stdin = self._proc.stdin
+        try:
+            while True:
+                frame = self._buffer.get()
+                if frame is None:
+                    break
+                stdin.write(memoryview(frame).cast('B'))
+        except (BrokenPipeError, OSError) as e:
+            self._error = e
+            # Keep draining so write() never blocks on a dead encoder
+            while self._buffer.get() is not None:
+                pass
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+
+def encode_frames(frames, size: tuple, output_path: str, fps: int = 24, codec: str = 'libx264', **options):
+    """Stream RGB frames through a FrameSink and encode them with the shared options.
+
+    ``options`` (preset, crf, threads) are passed through to ``video_args``.
+    """
+    with FrameSink(size, output_path, fps=fps, codec=codec, **options) as sink:
+        for frame in frames:
+            sink.write(frame)
+
+
+def encode_still(frame, duration: float, output_path: str, fps: int = 24, codec: str = 'libx264', **options):
+    """Encode one composited frame held on screen for ``duration`` seconds.
+
+    Only a one-second unit (plus any fractional remainder) is actually
+    encoded; the segment is that unit repeated by the concat demuxer, so
+    the cost no longer grows with the number of frames in the segment.
+    """
+    base = os.path.splitext(output_path)[0]
+    still_path = f"{base}.still.png"
+    Image.fromarray(frame).save(still_path, compress_level=1)
+
+    whole_seconds = int(duration)
+    remainder = round(duration - whole_seconds, 3)
+    parts = []
+    try:
+        if whole_seconds:
+            unit_path = f"{base}.unit.mp4"
+            _encode_held_frame(still_path, 1, unit_path, fps, codec, options)
+            parts += [unit_path] * whole_seconds
+        if remainder * fps >= 1:
+            tail_path = f"{base}.tail.mp4"
+            _encode_held_frame(still_path, remainder, tail_path, fps, codec, options)
+            parts.append(tail_path)
+        concat_segments(parts, output_path)
+    finally:
+        for path in {still_path, *parts}:
+            os.remove(path)
+
+
+def _encode_held_frame(still_path: str, duration: float, output_path: str, fps: int, codec: str, options: dict):
+    # The input is read at 1 fps and duplicated up to ``fps`` on output, so
+    # the PNG is decoded once per second rather than once per frame
+    args = ['-loop', '1', '-framerate', '1', '-i', still_path, '-t', f"{duration:.3f}"]
+    _run_ffmpeg(args + video_args(fps, codec, **options) + [output_path])
+
+
+def concat_segments(segment_paths: list, output_path: str, faststart: bool = False):
+    """Join encoded segments with the concat demuxer, without re-encoding"""
+    list_path = f"{output_path}.txt"
+    with open(list_path, 'w') as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        args = ['-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy']
+        if faststart:
+            args += ['-movflags', '+faststart']
+        _run_ffmpeg(args + [output_path])
+    except Exception:
+        _remove_partial(output_path)
+        raise
+    finally:
+        os.remove(list_path)
+
+
+def _remove_partial(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
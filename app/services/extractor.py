@@ -0,0 +1,230 @@
+# app/services/extractor.py
+
+from lxml import etree
+from lxml import html as lxml_html
+from urllib.parse import urljoin
+import re
+
+# Text inside these tags is not page copy (BeautifulSoup's get_text skips it too)
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+SECTION_TAGS = {'section', 'div'}
+FEATURE_TAGS = {'div', 'section', 'article'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4'}
+FEATURE_IDENTIFIERS = ['feature', 'benefit', 'service', 'product', 'card', 'item', 'highlight']
+MAIN_CONTENT_SELECTORS = ['article', 'main', '.content', '.post-content', '#main-content']
+
+HEX_COLOR_RE = re.compile(r'#(?:[0-9a-fA-F]{3}){1,2}')
+RGB_COLOR_RE = re.compile(r'rgb\([^)]+\)')
+
+
+def resolve_image_url(src: str, page_url: str) -> str:
+    """Absolute URL of an image reference, resolved against the page like a browser would"""
+    return urljoin(page_url, src.strip())
+
+
+class _Node:
+    """Per-element bookkeeping collected during the walk"""
+    __slots__ = ('el', 'raw_start', 'raw_end', 'start', 'end', 'heading', 'image')
+
+    def __init__(self, el, raw_start, start):
+        self.el = el
+        self.raw_start = raw_start
+        self.start = start
+        self.raw_end = raw_start
+        self.end = start
+        self.heading = None
+        self.image = None
+
+
+class _Document:
+    """Text runs of a parsed page, laid out once in document order.
+
+    Every element covers a contiguous range of runs, so an element's text
+    is a slice of the runs instead of a fresh walk over its subtree.
+    """
+
+    def __init__(self):
+        self.raw = []        # every text node, as in get_text()
+        self.stripped = []   # non-empty stripped text nodes, as in get_text(strip=True)
+        self.offsets = [0]   # running length of ``stripped``
+
+    def add(self, text: str):
+        self.raw.append(text)
+        text = text.strip()
+        if text:
+            self.stripped.append(text)
+            self.offsets.append(self.offsets[-1] + len(text))
+
+    def text(self, node: _Node) -> str:
+        return ''.join(self.raw[node.raw_start:node.raw_end])
+
+    def stripped_text(self, node: _Node) -> str:
+        return ''.join(self.stripped[node.start:node.end])
+
+    def stripped_length(self, node: _Node) -> int:
+        return self.offsets[node.end] - self.offsets[node.start]
+
+
+def _matches(el, selector: str) -> bool:
+    if selector.startswith('.'):
+        return selector[1:] in (el.get('class') or '').split()
+    if selector.startswith('#'):
+        return el.get('id') == selector[1:]
+    return el.tag == selector
+
+
+def extract(page_source: str, page_url: str) -> dict:
+    """Extract title, description, content, images, sections, features and colors in one pass"""
+    empty = {
+        'title': '', 'description': '', 'main_content': '', 'images': [],
+        'sections': [], 'features': [], 'colors': []
+    }
+    try:
+        # huge_tree lifts libxml2's nesting limit, which otherwise flattens deep div soups
+        parser = lxml_html.HTMLParser(huge_tree=True)
+        root = lxml_html.document_fromstring(page_source, parser=parser)
+    except (etree.ParserError, ValueError):
+        return empty
+
+    doc = _Document()
+    stack = []
+    skip_depth = 0
+    first = {}
+    metas = {}
+    images = []
+    section_nodes = []
+    feature_nodes = []
+    open_features = []
+    styles = []
+    paragraphs = {}
+    main_candidates = {}
+
+    # Comments and processing instructions only come through as their own events
+    for event, el in etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+        tag = el.tag
+        if event in ('comment', 'pi'):
+            # Only their tail is page text
+            if el.tail and not skip_depth:
+                doc.add(el.tail)
+            continue
+
+        if event == 'start':
+            node = _Node(el, len(doc.raw), len(doc.stripped))
+            stack.append(node)
+            if tag not in first:
+                first[tag] = node
+
+            if tag == 'meta':
+                for attr in ('name', 'property'):
+                    value = el.get(attr)
+                    if value in ('description', 'og:title', 'og:description'):
+                        metas.setdefault((attr, value), el)
+            elif tag == 'img':
+                src = el.get('src')
+                if src:
+                    images.append(resolve_image_url(src, page_url))
+                for feature in open_features:
+                    if feature.image is None:
+                        feature.image = el
+            elif tag in HEADING_TAGS:
+                for feature in open_features:
+                    if feature.heading is None:
+                        feature.heading = node
+            elif tag == 'style':
+                styles.append(el)
+            elif tag == 'p':
+                paragraphs[el] = node
+
+            for selector in MAIN_CONTENT_SELECTORS:
+                if selector not in main_candidates and _matches(el, selector):
+                    main_candidates[selector] = el
+
+            classes = (el.get('class') or '').split()
+            if tag in SECTION_TAGS and (classes or el.get('id')):
+                section_nodes.append(node)
+            if tag in FEATURE_TAGS:
+                class_text = ' '.join(classes).lower()
+                if any(identifier in class_text for identifier in FEATURE_IDENTIFIERS):
+                    feature_nodes.append(node)
+                    open_features.append(node)
+
+            if tag in SKIP_TEXT_TAGS:
+                skip_depth += 1
+            elif el.text and not skip_depth:
+                doc.add(el.text)
+        else:
+            node = stack.pop()
+            if tag in SKIP_TEXT_TAGS:
+                skip_depth -= 1
+            node.raw_end = len(doc.raw)
+            node.end = len(doc.stripped)
+            if open_features and open_features[-1] is node:
+                open_features.pop()
+            if el.tail and not skip_depth:
+                doc.add(el.tail)
+
+    # Title, falling back to the first h1 and then og:title
+    title = doc.text(first['title']).strip() if 'title' in first else ''
+    if not title:
+        if 'h1' in first:
+            title = doc.text(first['h1']).strip()
+        elif ('property', 'og:title') in metas:
+            title = (metas[('property', 'og:title')].get('content') or '').strip()
+
+    # Description, falling back to og:description
+    description = ''
+    meta_desc = metas.get(('name', 'description'))
+    if meta_desc is not None and meta_desc.get('content'):
+        description = meta_desc.get('content').strip()
+    if not description and ('property', 'og:description') in metas:
+        description = (metas[('property', 'og:description')].get('content') or '').strip()
+
+    main_content = ''
+    for selector in MAIN_CONTENT_SELECTORS:
+        container = main_candidates.get(selector)
+        if container is None:
+            continue
+        main_content = ' '.join(doc.text(paragraphs[p]).strip() for p in container.iter('p'))
+        if main_content:
+            break
+
+    # Sections, skipping wrappers whose text is identical to an enclosing section
+    sections = []
+    seen_ranges = set()
+    for node in section_nodes:
+        if doc.stripped_length(node) <= 50:
+            continue
+        span = (node.start, node.end)
+        if span in seen_ranges:
+            continue
+        seen_ranges.add(span)
+        sections.append({
+            'text': doc.stripped_text(node),
+            'type': node.el.tag,
+            'class': (node.el.get('class') or '').split(),
+            'id': node.el.get('id', '')
+        })
+
+    features = []
+    for node in feature_nodes:
+        features.append({
+            'title': doc.text(node.heading).strip() if node.heading else '',
+            'description': doc.stripped_text(node),
+            'image': resolve_image_url(node.image.get('src'), page_url) if node.image is not None and node.image.get('src') else None
+        })
+
+    colors = {}
+    for style in styles:
+        if style.text:
+            colors.update(dict.fromkeys(HEX_COLOR_RE.findall(style.text)))
+            colors.update(dict.fromkeys(RGB_COLOR_RE.findall(style.text)))
+
+    return {
+        'title': title,
+        'description': description,
+        'main_content': main_content,
+        'images': images,
+        'sections': sections,
+        'features': features,
+        'colors': list(colors)
+    }
@@ -0,0 +1,55 @@
+# app/services/http_fetcher.py
+
+from lxml import etree
+from lxml import html as lxml_html
+from app.services.http_client import get_http_client
+import re
+
+# Markers of pages that only render in the browser
+EMPTY_MOUNT_RE = re.compile(r'<(div|main)[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</\1>', re.I)
+NOSCRIPT_JS_RE = re.compile(r'<noscript[^>]*>[^<]*(enable|requires?)\s+javascript', re.I)
+CLIENT_RENDER_MARKERS = ('<app-root', 'ng-version=', 'data-server-rendered="false"')
+MIN_BODY_TEXT = 200
+
+
+class FetchedPage:
+    def __init__(self, html: str, url: str, headers: dict):
+        self.html = html
+        self.url = url
+        self.etag = headers.get('etag')
+        self.last_modified = headers.get('last-modified')
+
+
+def fetch_html(url: str) -> FetchedPage:
+    """GET a page over the shared keep-alive client; raises on HTTP errors and non-HTML bodies"""
+    response = get_http_client().get(url)
+    response.raise_for_status()
+    content_type = response.headers.get('content-type', '')
+    if 'html' not in content_type:
+        raise ValueError(f"Expected HTML from {url}, got {content_type or 'no content type'}")
+    return FetchedPage(response.text, str(response.url), response.headers)
+
+
+def body_text_length(page_source: str) -> int:
+    """Visible text length in <body>, ignoring scripts, styles and templates"""
+    try:
+        root = lxml_html.document_fromstring(page_source, parser=lxml_html.HTMLParser(huge_tree=True))
+    except (etree.ParserError, ValueError):
+        return 0
+    body = root.find('body')
+    if body is None:
+        return 0
+    etree.strip_elements(body, 'script', 'style', 'template', 'noscript', with_tail=False)
+    return len(''.join(body.itertext()).strip())
+
+
+def needs_browser(page_source: str) -> bool:
+    """Guess whether the server-rendered HTML is missing the real page content"""
+    text_length = body_text_length(page_source)
+    if text_length < MIN_BODY_TEXT:
+        return True
+    if EMPTY_MOUNT_RE.search(page_source) or any(marker in page_source for marker in CLIENT_RENDER_MARKERS):
+        return text_length < 4 * MIN_BODY_TEXT
+    if NOSCRIPT_JS_RE.search(page_source):
+        return text_length < 4 * MIN_BODY_TEXT
+    return False
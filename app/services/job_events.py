@@ -0,0 +1,22 @@
+# app/services/job_events.py
+
+from app.services.progress import get_progress_hub
+from app.services.status_writer import FINAL_VALUES, get_status_writer
+
+
+def apply_job_event(video_id: int, status: str, fields: dict):
+    """Queue a status change reported by the job queue for writing, and tell anyone watching the job"""
+    hub = get_progress_hub()
+    state = hub.snapshot(video_id)
+    if state is not None and state.get('status') in FINAL_VALUES:
+        return
+    get_status_writer().submit(video_id, {'status': status, **fields})
+    hub.publish(video_id, {'status': status, **fields})
+
+
+def publish_progress(video_id: int, fields: dict):
+    """Pass encode progress from a worker to watchers; the database gets the latest fraction on its next flush"""
+    if fields.get('total_frames'):
+        fields = dict(fields, progress=round(fields['frames'] / fields['total_frames'], 4))
+        get_status_writer().submit(video_id, {'progress': fields['progress']})
+    get_progress_hub().publish(video_id, fields)
@@ -0,0 +1,342 @@
+# app/services/job_queue.py
+
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from contextlib import contextmanager
+from app.core import metrics
+from app.core.config import settings
+from app.services.scheduler import DomainScheduler
+import multiprocessing
+import threading
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity and cannot take another job"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job was cancelled while running"""
+
+
+# Event status reserved for release_slot; never passed on to on_event
+RELEASE_SLOT = "__release_slot__"
+# Event status for encode progress, passed to on_progress instead of on_event
+PROGRESS = "__progress__"
+# Event status carrying a metrics observation from a worker; recorded, not passed on
+METRIC_EVENT = "__metric__"
+
+# Worker-side state, installed by _init_worker in each pool process
+_events = None
+_cancelled = None
+
+
+def _init_worker(events, cancelled, prewarm: bool = False):
+    global _events, _cancelled
+    _events = events
+    _cancelled = cancelled
+    metrics.set_forwarder(_forward_metric)
+    if prewarm:
+        # Before the worker takes its first job, not during it
+        from app.services.worker import prewarm as prewarm_worker
+        timings = prewarm_worker()
+        print(f"Worker ready in {sum(timings.values()):.2f}s")
+
+
+def _forward_metric(observation: tuple):
+    _events.put((None, METRIC_EVENT, observation))
+
+
+def emit(job_id, status: str, **fields):
+    """Report a stage transition from inside a worker"""
+    if _events is not None:
+        _events.put((job_id, status, fields))
+
+
+def release_slot(job_id):
+    """Tell the scheduler the job is done with the website, e.g. before rendering"""
+    if _events is not None:
+        _events.put((job_id, RELEASE_SLOT, {}))
+
+
+def report_progress(job_id, **fields):
+    """Report progress within a stage, e.g. frames encoded; not persisted"""
+    if _events is not None:
+        _events.put((job_id, PROGRESS, fields))
+
+
+def check_cancelled(job_id):
+    """Stop the current job between stages if it was cancelled"""
+    if _cancelled is not None and job_id in _cancelled:
+        raise JobCancelled(f"Job {job_id} was cancelled")
+
+
+class LocalBackend:
+    """Bounded process pool that needs no external broker.
+
+    Workers report progress through a multiprocessing queue which a relay
+    thread in this process drains into ``on_event``, and into
+    ``on_progress`` for updates within a stage.
+
+    Jobs wait in a DomainScheduler and are only handed to the pool when a
+    worker is idle, so the scheduler, not the pool's FIFO, decides the
+    order: interactive before bulk, round-robin across domains, within
+    each domain's concurrency and rate limits. A job holds its domain slot
+    until the worker calls ``release_slot`` or the job ends.
+    """
+
+    def __init__(self, on_event, max_workers: int = None, max_pending: int = None, max_backlog: int = None,
+                 scheduler: DomainScheduler = None, on_progress=None):
+        self.on_event = on_event
+        self.on_progress = on_progress
+        self.max_workers = max_workers or settings.job_workers
+        self.max_pending = max_pending or settings.job_queue_size
+        self.max_backlog = max_backlog or settings.job_backlog_size
+        self.scheduler = scheduler or DomainScheduler()
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._jobs = {}
+        self._holding = {}
+        # Interactive scrapes waiting for a slot; not jobs, so they never fill the queue
+        self._waiting_scrapes = 0
+        self._timer = None
+        self._executor = None
+        self._manager = None
+        self._events = None
+        self._cancelled = None
+        self._relay = None
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        self._manager = ctx.Manager()
+        self._cancelled = self._manager.dict()
+        self._events = ctx.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._events, self._cancelled, settings.worker_prewarm),
+        )
+        if settings.worker_prewarm:
+            # The pool only spawns workers as jobs arrive; start them all now
+            from app.services.worker import ready
+            for _ in range(self.max_workers):
+                self._executor.submit(ready)
+        self._relay = threading.Thread(target=self._relay_events, name="job-events", daemon=True)
+        self._relay.start()
+
+    def _queued_jobs(self) -> int:
+        # Interactive jobs running or waiting, leaving out scrapes waiting for a slot; call with _lock held
+        return len(self._futures) + self.scheduler.pending('interactive') - self._waiting_scrapes
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return self._queued_jobs() >= self.max_pending
+
+    def has_room(self, bulk_jobs: int) -> bool:
+        with self._lock:
+            return self.scheduler.pending('bulk') + bulk_jobs <= self.max_backlog
+
+    def submit(self, job_id, fn, *args, domain: str = ''):
+        """Queue an interactive job; ``domain`` is the site it scrapes"""
+        with self._lock:
+            if self._queued_jobs() >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} jobs)")
+            self._jobs[job_id] = (fn, args)
+            self.scheduler.push(job_id, domain, 'interactive')
+        self._dispatch()
+
+    def submit_bulk(self, jobs: list):
+        """Queue ``(job_id, fn, args, domain)`` tuples at bulk priority, all or none"""
+        with self._lock:
+            if self.scheduler.pending('bulk') + len(jobs) > self.max_backlog:
+                raise QueueFullError(f"Bulk backlog is full ({self.max_backlog} jobs)")
+            for job_id, fn, args, domain in jobs:
+                self._jobs[job_id] = (fn, args)
+                self.scheduler.push(job_id, domain, 'bulk')
+        self._dispatch()
+
+    @contextmanager
+    def scrape_slot(self, domain: str, timeout: float = None):
+        """Hold an interactive slot for ``domain`` while scraping in this process.
+
+        Raises QueueFullError if no slot frees up within ``timeout`` seconds
+        (SCRAPE_SLOT_TIMEOUT by default).
+        """
+        timeout = settings.scrape_slot_timeout if timeout is None else timeout
+        waiter = threading.Event()
+        with self._lock:
+            self.scheduler.push(waiter, domain, 'interactive')
+            self._waiting_scrapes += 1
+        self._dispatch()
+        if not waiter.wait(timeout):
+            with self._lock:
+                if self.scheduler.remove(waiter):
+                    self._waiting_scrapes -= 1
+                    raise QueueFullError(f"No scrape slot for {domain} within {timeout:.0f}s")
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.scheduler.release(domain)
+            self._dispatch()
+
+    def release_slot(self, job_id):
+        """Give back a job's domain and browser slot; later calls are no-ops"""
+        with self._lock:
+            domain = self._holding.pop(job_id, None)
+            if domain is not None:
+                self.scheduler.release(domain)
+        if domain is not None:
+            self._dispatch()
+
+    def _dispatch(self):
+        """Start whatever the scheduler allows while the pool has idle workers"""
+        started = []
+        with self._lock:
+            if self._executor is None:
+                return
+            while True:
+                picked = self.scheduler.pop(
+                    accept=lambda item: isinstance(item, threading.Event) or len(self._futures) < self.max_workers
+                )
+                if picked is None:
+                    break
+                item, domain = picked
+                if isinstance(item, threading.Event):
+                    self._waiting_scrapes -= 1
+                    item.set()
+                    continue
+                fn, args = self._jobs.pop(item)
+                self._holding[item] = domain
+                future = self._executor.submit(fn, item, *args)
+                self._futures[item] = future
+                started.append((item, future))
+
+            # Work held back only by a rate limit or low memory needs a wake-up call
+            delay = self.scheduler.retry_in()
+            if delay is not None and self._timer is None:
+                self._timer = threading.Timer(delay, self._wake)
+                self._timer.daemon = True
+                self._timer.start()
+        for job_id, future in started:
+            future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+
+    def _wake(self):
+        with self._lock:
+            self._timer = None
+        self._dispatch()
+
+    def cancel(self, job_id) -> bool:
+        """Cancel a queued job outright, or flag a running one to stop at its next stage"""
+        with self._lock:
+            future = self._futures.get(job_id)
+            waiting = self.scheduler.remove(job_id)
+            if waiting:
+                self._jobs.pop(job_id, None)
+        if waiting:
+            metrics.JOBS_TOTAL.inc(status="cancelled")
+            self.on_event(job_id, "cancelled", {})
+            return True
+        if future is None:
+            return False
+        if not future.cancel():
+            self._cancelled[job_id] = True
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            futures = list(self._futures.values())
+            scheduler = self.scheduler.stats()
+            queued = self.scheduler.pending('interactive') - self._waiting_scrapes
+            waiting_scrapes = self._waiting_scrapes
+            backlog = self.scheduler.pending('bulk')
+        running = sum(1 for f in futures if f.running())
+        return {
+            'workers': self.max_workers,
+            'capacity': self.max_pending,
+            'running': running,
+            'queued': len(futures) - running + queued,
+            'backlog': backlog,
+            'waiting_scrapes': waiting_scrapes,
+            'scheduler': scheduler,
+        }
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+            domain = self._holding.pop(job_id, None)
+            if domain is not None:
+                self.scheduler.release(domain)
+        self._cancelled.pop(job_id, None)
+        self._dispatch()
+        try:
+            result = future.result()
+        except (CancelledError, JobCancelled):
+            metrics.JOBS_TOTAL.inc(status="cancelled")
+            self.on_event(job_id, "cancelled", {})
+        except Exception as e:
+            print(f"Job {job_id} failed: {str(e)}")
+            metrics.JOBS_TOTAL.inc(status="failed")
+            self.on_event(job_id, "failed", {'error_message': str(e)})
+        else:
+            metrics.JOBS_TOTAL.inc(status="completed")
+            self.on_event(job_id, "completed", result or {})
+
+    def _relay_events(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                break
+            job_id, status, fields = event
+            if status == RELEASE_SLOT:
+                self.release_slot(job_id)
+                continue
+            if status == METRIC_EVENT:
+                metrics.record(fields)
+                continue
+            try:
+                if status == PROGRESS:
+                    if self.on_progress is not None:
+                        self.on_progress(job_id, fields)
+                else:
+                    self.on_event(job_id, status, fields)
+            except Exception as e:
+                print(f"Error applying job event: {str(e)}")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            if self._timer is not None:
+                self._timer.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self._events is not None:
+            self._events.put(None)
+            self._relay.join(timeout=5)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue(on_event=None, on_progress=None):
+    """Process-wide job queue; the backend is chosen by JOB_BACKEND"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            if on_event is None:
+                raise RuntimeError("Job queue has not been started")
+            if settings.job_backend != "local":
+                raise ValueError(f"Unknown job backend: {settings.job_backend}")
+            _queue = LocalBackend(on_event, on_progress=on_progress)
+            _queue.start()
+        return _queue
+
+
+def shutdown_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.shutdown()
+            _queue = None
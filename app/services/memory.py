@@ -0,0 +1,99 @@
+# app/services/memory.py
+
+import os
+import resource
+import threading
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _rss_bytes(pid) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _descendants(pid: int) -> list:
+    """Child processes of ``pid`` at any depth (render workers and their ffmpeg encoders)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so parse from the closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def process_tree_rss(pid: int = None) -> int:
+    """Resident memory of a process and all of its descendants, in bytes"""
+    pid = pid or os.getpid()
+    return _rss_bytes(pid) + sum(_rss_bytes(child) for child in _descendants(pid))
+
+
+def available_memory_mb() -> float:
+    """Memory the kernel could hand out without swapping; infinite where unknown"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return float('inf')
+
+
+class PeakMemory:
+    """Tracks the peak resident memory of this process tree while a block runs.
+
+    A background thread samples /proc every ``interval`` seconds. Where /proc
+    is not available, the process's lifetime peak from getrusage is used.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def peak_mb(self) -> int:
+        return round(self.peak_bytes / (1024 * 1024))
+
+    def sample(self):
+        self.peak_bytes = max(self.peak_bytes, process_tree_rss())
+
+    def __enter__(self):
+        if os.path.isdir('/proc'):
+            self.sample()
+            self._thread = threading.Thread(target=self._run, name="peak-memory", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.sample()
+        else:
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            scale = 1 if os.uname().sysname == 'Darwin' else 1024
+            self.peak_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
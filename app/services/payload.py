@@ -0,0 +1,74 @@
+# app/services/payload.py
+
+from app.core.config import settings
+import hashlib
+
+# Top-level scrape fields a client may ask for
+PAYLOAD_FIELDS = ('title', 'description', 'main_content', 'images', 'sections', 'features',
+                  'colors', 'screenshots', 'wait_time', 'fetch_mode')
+
+
+def check_fields(fields):
+    """Raise ValueError if any requested field is not a scrape field"""
+    unknown = [name for name in fields or () if name not in PAYLOAD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+
+def text_hash(text: str) -> str:
+    """Short content hash of a text, ignoring differences in whitespace"""
+    return hashlib.sha1(' '.join(text.split()).encode()).hexdigest()[:16]
+
+
+def truncate(text: str, limit: int) -> str:
+    if not text or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + '…'
+
+
+def dedupe_sections(sections: list) -> list:
+    """Sections with text already seen in an earlier section dropped"""
+    seen = set()
+    unique = []
+    for section in sections:
+        digest = text_hash(section['text'])
+        if digest in seen:
+            continue
+        seen.add(digest)
+        unique.append(dict(section, hash=digest))
+    return unique
+
+
+def shape_payload(data: dict, fields=None, compact: bool = False, max_text: int = None,
+                  section_offset: int = 0, section_limit: int = None) -> dict:
+    """The parts of a scrape a client asked for.
+
+    ``fields`` picks top-level keys (all of them by default). Sections are
+    paginated by ``section_offset`` and ``section_limit``, with the total in
+    ``sections_total``. In compact mode sections with repeated text are
+    dropped, and section texts, feature descriptions and the main content
+    are cut to ``max_text`` characters. Raises ValueError for unknown fields.
+    """
+    check_fields(fields)
+    fields = fields or PAYLOAD_FIELDS
+    if max_text is None:
+        max_text = settings.payload_max_text
+    if section_limit is None and compact:
+        section_limit = settings.payload_section_limit
+
+    payload = {name: data[name] for name in fields if name in data}
+    if 'sections' in payload:
+        sections = dedupe_sections(payload['sections']) if compact else payload['sections']
+        end = None if section_limit is None else section_offset + section_limit
+        page = sections[section_offset:end]
+        if compact:
+            page = [dict(section, text=truncate(section['text'], max_text)) for section in page]
+        payload['sections'] = page
+        payload['sections_total'] = len(sections)
+    if compact:
+        if payload.get('main_content'):
+            payload['main_content'] = truncate(payload['main_content'], max_text)
+        if 'features' in payload:
+            payload['features'] = [dict(feature, description=truncate(feature['description'], max_text))
+                                   for feature in payload['features']]
+    return payload
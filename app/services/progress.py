@@ -0,0 +1,116 @@
+# app/services/progress.py
+
+from collections import OrderedDict
+import asyncio
+import threading
+
+# Latest state kept for this many jobs, so late watchers need no database read
+MAX_SNAPSHOTS = 1000
+# Events buffered per watcher; a slow client loses the oldest progress updates
+SUBSCRIBER_BUFFER = 64
+
+
+class Subscription:
+    """One watcher of a job: events arrive on an asyncio queue in the watcher's loop"""
+
+    def __init__(self, video_id: int, loop):
+        self.video_id = video_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+
+    def _put(self, event: dict):
+        # Runs in the watcher's loop
+        while self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class ProgressHub:
+    """In-process pub/sub for job status and encode progress.
+
+    The job queue's relay thread publishes every stage transition and
+    progress update. Watchers subscribe per video and get events on their
+    own event loop. The hub keeps the latest state of each job, so however
+    many clients watch a job, the database is read at most once for it.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._snapshots = OrderedDict()
+
+    def subscribe(self, video_id: int) -> Subscription:
+        """Must be called from the event loop the watcher reads on"""
+        subscription = Subscription(video_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(video_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            watchers = self._subscribers.get(subscription.video_id)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._subscribers[subscription.video_id]
+
+    def snapshot(self, video_id: int) -> dict:
+        """Latest known state of a job, or None if nothing was published for it"""
+        with self._lock:
+            state = self._snapshots.get(video_id)
+            return dict(state) if state is not None else None
+
+    def seed(self, video_id: int, state: dict) -> dict:
+        """Remember state read from the database, unless newer state was published meanwhile"""
+        with self._lock:
+            if video_id not in self._snapshots:
+                self._remember(video_id, dict(state))
+            return dict(self._snapshots[video_id])
+
+    def publish(self, video_id: int, event: dict):
+        """Merge an event into the job's state and pass it to every watcher; callable from any thread"""
+        with self._lock:
+            state = self._snapshots.get(video_id)
+            # A progress-only event for a job with no snapshot (never seen or evicted)
+            # would leave one without a status; late watchers read the database instead
+            if state is not None or 'status' in event:
+                state = dict(state or {'id': video_id})
+                state.update(event)
+                self._remember(video_id, state)
+            watchers = list(self._subscribers.get(video_id, ()))
+        for subscription in watchers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, dict(event))
+            except RuntimeError:
+                # The watcher's loop has closed
+                self.unsubscribe(subscription)
+
+    def _remember(self, video_id: int, state: dict):
+        self._snapshots[video_id] = state
+        self._snapshots.move_to_end(video_id)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'jobs_watched': len(self._subscribers),
+                'watchers': sum(len(watchers) for watchers in self._subscribers.values()),
+                'snapshots': len(self._snapshots),
+            }
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_progress_hub() -> ProgressHub:
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = ProgressHub()
+        return _hub
@@ -0,0 +1,165 @@
+# app/services/readiness.py
+
+from selenium.common.exceptions import WebDriverException
+from urllib.parse import urlsplit
+from app.core.config import settings
+import time
+
+# Installed before any page script runs: counts in-flight fetch/XHR requests
+# and records when the network and the DOM last changed. Attribute changes
+# are not DOM changes here: carousels and animations toggle classes and
+# styles for as long as the page is open.
+PAGE_HOOKS_JS = """
+(function () {
+    if (window.__readiness) { return; }
+    var state = window.__readiness = {inflight: 0, lastNetwork: Date.now(), lastMutation: Date.now()};
+    function begin() { state.inflight += 1; state.lastNetwork = Date.now(); }
+    function end() { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = Date.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; }
+            );
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end);
+        return originalSend.apply(this, arguments);
+    };
+
+    function observe() {
+        new MutationObserver(function () { state.lastMutation = Date.now(); })
+            .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    }
+    if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+})();
+"""
+
+
+def install_page_hooks(driver):
+    """Register the hooks once per browser session; they then run on every navigation"""
+    if getattr(driver, '_readiness_hooks', False):
+        return
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': PAGE_HOOKS_JS})
+    except WebDriverException:
+        return
+    driver._readiness_hooks = True
+
+
+class ReadinessCheck:
+    """A condition polled in the page until it holds or its timeout runs out"""
+    name = 'check'
+    script = 'return true;'
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout or settings.readiness_timeout
+
+    def begin(self):
+        """Called before the check is first polled for a page"""
+
+    def is_ready(self, driver) -> bool:
+        return bool(driver.execute_script(self.script))
+
+
+class DocumentReady(ReadinessCheck):
+    name = 'ready_state'
+    script = "return document.readyState === 'complete';"
+
+
+class NetworkIdle(ReadinessCheck):
+    """No fetch/XHR in flight for ``idle_ms``; passes at once if the hooks are missing"""
+    name = 'network_idle'
+
+    def __init__(self, idle_ms: int = 500, timeout: float = None):
+        super().__init__(timeout)
+        self.script = (
+            "var s = window.__readiness; "
+            f"return !s || (s.inflight === 0 && Date.now() - s.lastNetwork >= {int(idle_ms)});"
+        )
+
+
+class DomQuiet(ReadinessCheck):
+    """No DOM mutations for ``quiet_ms``.
+
+    Pages whose content never stops changing (tickers, rotating text)
+    would always wait out the timeout, so after ``max_wait`` seconds an
+    idle network is enough.
+    """
+    name = 'dom_quiet'
+
+    def __init__(self, quiet_ms: int = 500, max_wait: float = None, timeout: float = None):
+        super().__init__(timeout)
+        self.max_wait = settings.readiness_quiet_max_wait if max_wait is None else max_wait
+        self._started = 0.0
+        self.script = (
+            "var s = window.__readiness; "
+            f"return !s || Date.now() - s.lastMutation >= {int(quiet_ms)} || (arguments[0] && s.inflight === 0);"
+        )
+
+    def begin(self):
+        self._started = time.monotonic()
+
+    def is_ready(self, driver) -> bool:
+        capped = time.monotonic() - self._started >= self.max_wait
+        return bool(driver.execute_script(self.script, capped))
+
+
+class SelectorPresent(ReadinessCheck):
+    """A site-specific element has been rendered"""
+    name = 'selector'
+    script = "return document.querySelector(arguments[0]) !== null;"
+
+    def __init__(self, selector: str, timeout: float = None):
+        super().__init__(timeout)
+        self.selector = selector
+
+    def is_ready(self, driver) -> bool:
+        return bool(driver.execute_script(self.script, self.selector))
+
+
+class PageReadiness:
+    """Runs checks in order under one overall budget and measures the wait"""
+
+    def __init__(self, checks: list, budget: float = None, poll_interval: float = 0.1):
+        self.checks = checks
+        self.budget = budget or settings.readiness_budget
+        self.poll_interval = poll_interval
+
+    def wait(self, driver) -> dict:
+        start = time.monotonic()
+        deadline = start + self.budget
+        timed_out = []
+        for check in self.checks:
+            check_deadline = min(deadline, time.monotonic() + check.timeout)
+            check.begin()
+            while True:
+                try:
+                    if check.is_ready(driver):
+                        break
+                except WebDriverException:
+                    pass
+                if time.monotonic() >= check_deadline:
+                    timed_out.append(check.name)
+                    break
+                time.sleep(self.poll_interval)
+        return {
+            'wait_time': round(time.monotonic() - start, 3),
+            'timed_out': timed_out,
+        }
+
+
+def readiness_for(url: str, selector: str = None) -> PageReadiness:
+    """Default checks, plus the per-site selector configured for the URL's host"""
+    checks = [DocumentReady(), NetworkIdle(), DomQuiet()]
+    selector = selector or settings.readiness_selectors.get(urlsplit(url).hostname or '')
+    if selector:
+        checks.append(SelectorPresent(selector))
+    return PageReadiness(checks)
@@ -0,0 +1,28 @@
+# app/services/render_profiles.py
+
+from app.core.config import settings
+from collections import namedtuple
+
+# Output size, frame rate and x264 settings for one kind of render.
+# threads=0 lets the encoder pick a thread count.
+RenderProfile = namedtuple('RenderProfile', ['name', 'width', 'height', 'fps', 'preset', 'crf', 'threads'])
+
+# Layout constants in VideoGenerator are written for this height and scaled to the profile
+BASE_HEIGHT = 1080
+
+RENDER_PROFILES = {
+    'preview': RenderProfile('preview', 640, 360, 12, 'ultrafast', 30, 0),
+    'standard': RenderProfile('standard', 1920, 1080, 24, 'medium', 23, 0),
+    'final': RenderProfile('final', 1920, 1080, 30, 'slow', 18, 0),
+}
+
+
+def get_render_profile(name: str = None) -> RenderProfile:
+    """Look up a profile by name, applying the ENCODER_THREADS override"""
+    name = name or settings.render_profile
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{name}', expected one of: {', '.join(RENDER_PROFILES)}")
+    profile = RENDER_PROFILES[name]
+    if settings.encoder_threads:
+        profile = profile._replace(threads=settings.encoder_threads)
+    return profile
@@ -0,0 +1,201 @@
+# app/services/scheduler.py
+
+from app.core.config import settings
+from app.services.memory import available_memory_mb
+from collections import deque
+from urllib.parse import urlsplit
+import time
+
+# Highest priority first
+PRIORITIES = ('interactive', 'bulk')
+# How long to wait before re-checking admission when memory is short
+MEMORY_RETRY = 1.0
+
+
+def domain_of(url: str) -> str:
+    """The host a scrape will load, which is what politeness limits apply to"""
+    host = (urlsplit(url.strip()).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class TokenBucket:
+    """Allows ``rate`` starts per second on average, and bursts of up to ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_in(self, now: float) -> float:
+        """Seconds until a start is allowed; 0 if one is allowed now"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        if self.rate > 0:
+            self._refill(now)
+            self.tokens -= 1
+
+
+class _Domain:
+    """Queues, limits and wait statistics for one domain"""
+
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self.queues = {priority: deque() for priority in PRIORITIES}
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.active = 0
+        self.started = 0
+        self.waited_total = 0.0
+        self.waited_max = 0.0
+
+
+class DomainScheduler:
+    """Decides which queued scrape may start next.
+
+    Each domain has its own concurrency limit and token-bucket start rate.
+    Domains take turns round-robin, and interactive work always goes before
+    bulk work. Nothing starts while every browser slot is busy or free
+    memory is below the floor. Not thread-safe: the owner holds a lock
+    around every call.
+    """
+
+    def __init__(self, concurrency: int = None, rate: float = None, burst: int = None,
+                 overrides: dict = None, browser_slots: int = None, min_free_memory_mb: int = None):
+        self.concurrency = concurrency or settings.domain_concurrency
+        self.rate = settings.domain_rate if rate is None else rate
+        self.burst = burst or settings.domain_burst
+        self.overrides = settings.domain_limits if overrides is None else overrides
+        self.browser_slots = browser_slots or settings.browser_slots
+        self.min_free_memory_mb = settings.min_free_memory_mb if min_free_memory_mb is None else min_free_memory_mb
+        self.active = 0
+        self._domains = {}
+        # Domains with queued work, per priority, in round-robin order
+        self._rotation = {priority: deque() for priority in PRIORITIES}
+
+    def _domain(self, domain: str) -> _Domain:
+        state = self._domains.get(domain)
+        if state is None:
+            limits = self.overrides.get(domain, {})
+            state = self._domains[domain] = _Domain(
+                limits.get('concurrency', self.concurrency),
+                limits.get('rate', self.rate),
+                limits.get('burst', self.burst),
+            )
+        return state
+
+    def push(self, item, domain: str, priority: str = 'interactive'):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        queue = self._domain(domain).queues[priority]
+        if not queue:
+            self._rotation[priority].append(domain)
+        queue.append((item, time.monotonic()))
+
+    def remove(self, item) -> bool:
+        """Drop a queued item that has not started; False if it is not queued"""
+        for domain, state in self._domains.items():
+            for priority, queue in state.queues.items():
+                for entry in queue:
+                    if entry[0] is item or entry[0] == item:
+                        queue.remove(entry)
+                        if not queue:
+                            self._rotation[priority].remove(domain)
+                        return True
+        return False
+
+    def pending(self, priority: str = None) -> int:
+        priorities = [priority] if priority else PRIORITIES
+        return sum(len(state.queues[p]) for state in self._domains.values() for p in priorities)
+
+    def admitted(self) -> bool:
+        """Global admission: a free browser slot and enough free memory.
+
+        The memory floor never blocks the first start, so work always progresses.
+        """
+        if self.active >= self.browser_slots:
+            return False
+        return self.active == 0 or available_memory_mb() >= self.min_free_memory_mb
+
+    def pop(self, accept=None):
+        """Start the next eligible item and return ``(item, domain)``, or None.
+
+        ``accept`` can veto an item, e.g. a job while the worker pool is busy.
+        A vetoed item does not hold up the items queued behind it.
+        """
+        if not self.admitted():
+            return None
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            rotation = self._rotation[priority]
+            for _ in range(len(rotation)):
+                domain = rotation[0]
+                rotation.rotate(-1)
+                state = self._domains[domain]
+                queue = state.queues[priority]
+                if state.active >= state.concurrency or state.bucket.ready_in(now) > 0:
+                    continue
+                index = 0
+                if accept is not None:
+                    index = next((i for i, (item, _) in enumerate(queue) if accept(item)), None)
+                    if index is None:
+                        continue
+                item, enqueued = queue[index]
+                del queue[index]
+                if not queue:
+                    rotation.remove(domain)
+                state.bucket.take(now)
+                state.active += 1
+                state.started += 1
+                waited = now - enqueued
+                state.waited_total += waited
+                state.waited_max = max(state.waited_max, waited)
+                self.active += 1
+                return item, domain
+        return None
+
+    def release(self, domain: str):
+        """A started item no longer needs its domain or browser slot"""
+        state = self._domains.get(domain)
+        if state is not None and state.active > 0:
+            state.active -= 1
+            self.active -= 1
+
+    def retry_in(self) -> float:
+        """Seconds until queued work might become eligible without a release; None if it cannot"""
+        if not self.pending():
+            return None
+        if 0 < self.active < self.browser_slots and available_memory_mb() < self.min_free_memory_mb:
+            return MEMORY_RETRY
+        now = time.monotonic()
+        delays = [
+            state.bucket.ready_in(now) for state in self._domains.values()
+            if state.active < state.concurrency and any(state.queues.values())
+        ]
+        delays = [delay for delay in delays if delay > 0]
+        return min(delays) if delays else None
+
+    def stats(self) -> dict:
+        domains = {}
+        for domain, state in self._domains.items():
+            domains[domain] = {
+                'queued': {priority: len(queue) for priority, queue in state.queues.items()},
+                'active': state.active,
+                'started': state.started,
+                'avg_wait': round(state.waited_total / state.started, 3) if state.started else 0.0,
+                'max_wait': round(state.waited_max, 3),
+            }
+        return {
+            'browser_slots': self.browser_slots,
+            'active': self.active,
+            'free_memory_mb': round(min(available_memory_mb(), 1e12)),
+            'domains': domains,
+        }
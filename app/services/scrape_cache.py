@@ -0,0 +1,206 @@
+# app/services/scrape_cache.py
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from app.core import metrics
+from app.core.config import settings
+from app.services.http_client import get_http_client
+import hashlib
+import httpx
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys and de-duplication"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith('utm_'))
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class ScrapeCache:
+    """Scrape results and screenshots on disk, keyed on normalized URL and viewport.
+
+    Entries younger than ``ttl`` are served as-is. Older entries are
+    revalidated against the page's ETag / Last-Modified with a cheap
+    HEAD request before a full browser scrape is needed.
+
+    Each entry is a symlink to a directory holding one version of it;
+    storing writes a new directory and repoints the link in one rename.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl: float = None):
+        self.cache_dir = cache_dir or settings.scrape_cache_dir
+        self.ttl = settings.scrape_cache_ttl if ttl is None else ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_dir(self, url: str, viewport: tuple) -> str:
+        key = f"{normalize_url(url)}|{viewport[0]}x{viewport[1]}"
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest())
+
+    def lookup(self, url: str, viewport: tuple) -> dict:
+        """Cached scrape result, revalidating stale entries; None on a miss"""
+        entry_dir = self._entry_dir(url, viewport)
+        try:
+            with open(os.path.join(entry_dir, 'meta.json')) as f:
+                meta = json.load(f)
+            with open(os.path.join(entry_dir, 'data.json')) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            metrics.SCRAPE_CACHE_TOTAL.inc(result='miss')
+            return None
+
+        if time.time() - meta['fetched_at'] > self.ttl:
+            if not self._revalidate(url, meta):
+                metrics.SCRAPE_CACHE_TOTAL.inc(result='miss')
+                return None
+            meta['fetched_at'] = time.time()
+            self._write_json(os.path.join(entry_dir, 'meta.json'), meta)
+            metrics.SCRAPE_CACHE_TOTAL.inc(result='revalidated')
+        else:
+            metrics.SCRAPE_CACHE_TOTAL.inc(result='fresh')
+        metrics.SCRAPE_CACHE_BYTES_SAVED.inc(meta.get('size', 0))
+        return data
+
+    def cached_screenshots(self, url: str, viewport: tuple) -> dict:
+        """Screenshots from any stored entry for the URL, however old"""
+        entry_dir = self._entry_dir(url, viewport)
+        try:
+            with open(os.path.join(entry_dir, 'data.json')) as f:
+                screenshots = json.load(f).get('screenshots', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+        if screenshots and all(os.path.exists(path) for path in screenshots.values()):
+            return screenshots
+        return {}
+
+    def store(self, url: str, viewport: tuple, data: dict, validators: dict = None) -> dict:
+        """Save a fresh scrape; screenshots are written into the entry so later scrapes cannot overwrite them.
+
+        Screenshots may be given as PNG bytes or as paths to copy. The
+        returned data refers to the stored files.
+        """
+        entry_dir = self._entry_dir(url, viewport)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=os.path.basename(entry_dir) + '.')
+        data = dict(data)
+        screenshots = {}
+        size = 0
+        for name, image in data.get('screenshots', {}).items():
+            target = os.path.join(tmp_dir, f"{name}.png")
+            if isinstance(image, bytes):
+                with open(target, 'wb') as f:
+                    f.write(image)
+            else:
+                shutil.copyfile(image, target)
+            screenshots[name] = os.path.join(entry_dir, f"{name}.png")
+            size += os.path.getsize(target)
+        data['screenshots'] = screenshots
+
+        payload = json.dumps(data)
+        meta = {'url': url, 'fetched_at': time.time(), 'size': size + len(payload)}
+        meta.update(validators if validators is not None else self._validators(url))
+        with open(os.path.join(tmp_dir, 'data.json'), 'w') as f:
+            f.write(payload)
+        self._write_json(os.path.join(tmp_dir, 'meta.json'), meta)
+
+        self._swap_in(entry_dir, tmp_dir)
+        return data
+
+    def _swap_in(self, entry_dir: str, version_dir: str):
+        """Point an entry at a new version; a concurrent lookup sees the old one or the new one"""
+        old_version = os.path.realpath(entry_dir) if os.path.islink(entry_dir) else None
+        if old_version is None and os.path.isdir(entry_dir):
+            # Stored before entries were versioned
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        link = f"{version_dir}.link"
+        os.symlink(os.path.basename(version_dir), link)
+        os.replace(link, entry_dir)
+        if old_version is not None:
+            shutil.rmtree(old_version, ignore_errors=True)
+
+    def _validators(self, url: str) -> dict:
+        try:
+            response = get_http_client().head(url)
+        except httpx.HTTPError:
+            return {}
+        return {
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified'),
+        }
+
+    def _revalidate(self, url: str, meta: dict) -> bool:
+        """True if the page is unchanged since the entry was stored"""
+        if not meta.get('etag') and not meta.get('last_modified'):
+            return False
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            client = get_http_client()
+            response = client.head(url, headers=headers)
+            if response.status_code in (405, 501):
+                # HEAD not supported: conditional GET, closed before reading the body
+                with client.stream('GET', url, headers=headers) as response:
+                    pass
+        except httpx.HTTPError:
+            return False
+
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+        if meta.get('etag'):
+            return response.headers.get('etag') == meta['etag']
+        return response.headers.get('last-modified') == meta['last_modified']
+
+    def _write_json(self, path: str, value: dict):
+        # Readers never see a half-written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> dict:
+        """Lookups by every scrape cache, read from the metrics registry.
+
+        In the API process that includes the job workers' lookups, which
+        reach it through the forwarded metrics.
+        """
+        counts = {result: int(metrics.SCRAPE_CACHE_TOTAL.value(result=result))
+                  for result in ('fresh', 'revalidated', 'miss')}
+        hits = counts['fresh'] + counts['revalidated']
+        lookups = hits + counts['miss']
+        return {
+            'hits': hits,
+            'revalidated': counts['revalidated'],
+            'misses': counts['miss'],
+            'bytes_saved': int(metrics.SCRAPE_CACHE_BYTES_SAVED.value()),
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> ScrapeCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScrapeCache()
+        return _cache
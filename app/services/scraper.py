@@ -1,95 +1,195 @@
 # app/services/scraper.py
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 from bs4 import BeautifulSoup
-import os
-import time
+from PIL import Image
+from app.services.driver_pool import DriverPool, get_driver_pool
+from app.services.scrape_cache import ScrapeCache, get_scrape_cache
+from app.services.extractor import extract, resolve_image_url
+from app.services.readiness import PageReadiness, install_page_hooks, readiness_for
+from app.services.http_fetcher import fetch_html, needs_browser
+from app.core import metrics
+from app.core.config import settings
+import base64
+import io
+import math
+
+# Chrome cannot capture taller surfaces than this in one screenshot
+MAX_CAPTURE_HEIGHT = 16384
+HERO_LOCATORS = [(By.CLASS_NAME, 'hero'), (By.ID, 'hero'), (By.TAG_NAME, 'header')]
 
 class WebsiteScraper:
-    def __init__(self):
-        self.setup_driver()
-        self.screenshots_dir = "screenshots"
-        os.makedirs(self.screenshots_dir, exist_ok=True)
-    
-    def setup_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-
-    def scrape(self, url: str) -> dict:
+    def __init__(self, pool: DriverPool = None, cache: ScrapeCache = None,
+                 readiness: PageReadiness = None, mode: str = None, capture_screenshots: bool = True,
+                 in_memory_screenshots: bool = False):
+        self.pool = pool or get_driver_pool()
+        self.readiness = readiness
+        # 'browser' always renders in Chrome, 'http' never does for the HTML,
+        # 'auto' fetches over HTTP and escalates when the page needs JavaScript
+        self.mode = mode or settings.scrape_mode
+        self.capture_screenshots = capture_screenshots
+        # Return freshly captured screenshots as PNG bytes instead of cache paths,
+        # for callers that render in the same process
+        self.in_memory_screenshots = in_memory_screenshots
+        self.cache = cache or get_scrape_cache()
+        self.driver = None
+        self.viewport = (1920, 1080)
+
+    def scrape(self, url: str, force_refresh: bool = False) -> dict:
+        if not force_refresh:
+            with metrics.span('scrape.cache_lookup'):
+                cached = self.cache.lookup(url, self.viewport)
+            if cached is not None:
+                print(f"Using cached scrape for URL: {url}")
+                metrics.SCRAPES_TOTAL.inc(mode='cache')
+                return cached
+        
         try:
             print(f"Starting to scrape URL: {url}")
-            self.driver.get(url)
-            time.sleep(2)  # Wait for dynamic content
-            
-            # Take screenshots
-            screenshots = self._take_screenshots()
-            
-            content = self.driver.page_source
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Get title from multiple sources
-            title = self._get_title(soup)
-            if not title:
-                h1 = soup.find('h1')
-                if h1:
-                    title = h1.text.strip()
-                else:
-                    meta_title = soup.find('meta', {'property': 'og:title'})
-                    if meta_title:
-                        title = meta_title.get('content', '').strip()
-            
-            # Get description from multiple sources
-            description = self._get_description(soup)
-            if not description:
-                meta_desc = soup.find('meta', {'property': 'og:description'})
-                if meta_desc:
-                    description = meta_desc.get('content', '').strip()
-            
-            # Get all content
-            data = {
-                'title': title,
-                'description': description,
-                'main_content': self._get_main_content(soup),
-                'images': self._get_images(soup),
-                'screenshots': screenshots,
-                'sections': self._get_sections(soup),
-                'features': self._get_features(soup),
-                'colors': self._get_colors(soup)
-            }
-            
-            print(f"Scraped data: {data}")
-            return data
+            if self.mode != 'browser':
+                data = self._scrape_http(url)
+                if data is not None:
+                    return data
             
+            with self.pool.driver() as driver:
+                self.driver = driver
+                data = self._scrape_page(url)
+            metrics.SCRAPES_TOTAL.inc(mode='browser')
+            return self._store(url, data)
         except Exception as e:
             print(f"Error scraping website: {str(e)}")
             raise
         finally:
-            self.driver.quit()
+            self.driver = None
+
+    def _scrape_http(self, url: str) -> dict:
+        """Browserless path: fetch the HTML directly and only use Chrome for screenshots.
+
+        Returns None when the page should be rendered in the browser instead.
+        """
+        try:
+            with metrics.span('scrape.http_fetch'):
+                page = fetch_html(url)
+        except Exception as e:
+            if self.mode == 'http':
+                raise
+            print(f"HTTP fetch failed, falling back to browser: {str(e)}")
+            return None
+        
+        if self.mode == 'auto' and needs_browser(page.html):
+            print(f"Page needs client-side rendering, using browser: {url}")
+            return None
+        
+        data = self._extract(page.html, page.url)
+        data['screenshots'] = self._screenshots_for(url)
+        data['wait_time'] = 0.0
+        data['fetch_mode'] = 'http'
+        metrics.SCRAPES_TOTAL.inc(mode='http')
+        validators = {'etag': page.etag, 'last_modified': page.last_modified}
+        return self._store(url, data, validators=validators)
+
+    def _store(self, url: str, data: dict, validators: dict = None) -> dict:
+        """Persist a scrape in the cache, which keeps a copy of the screenshots per entry"""
+        with metrics.span('scrape.cache_store'):
+            stored = self.cache.store(url, self.viewport, data, validators=validators)
+        if self.in_memory_screenshots:
+            stored['screenshots'] = data['screenshots']
+        return stored
+
+    def _screenshots_for(self, url: str) -> dict:
+        """Screenshots from a previous scrape if we have them, else a browser capture"""
+        if not self.capture_screenshots:
+            return {}
+        screenshots = self.cache.cached_screenshots(url, self.viewport)
+        if screenshots:
+            return screenshots
+        
+        with self.pool.driver() as driver:
+            self.driver = driver
+            self._load(url)
+            return self._take_screenshots()
+
+    def _load(self, url: str) -> dict:
+        """Navigate and wait until the page has settled instead of sleeping a fixed time"""
+        install_page_hooks(self.driver)
+        with metrics.span('scrape.navigate'):
+            self.driver.get(url)
+        
+        with metrics.span('scrape.wait'):
+            readiness = (self.readiness or readiness_for(url)).wait(self.driver)
+        print(f"Page ready after {readiness['wait_time']:.2f}s"
+              + (f" (timed out: {', '.join(readiness['timed_out'])})" if readiness['timed_out'] else ""))
+        return readiness
+
+    def _scrape_page(self, url: str) -> dict:
+        readiness = self._load(url)
+        
+        # Take screenshots
+        screenshots = self._take_screenshots() if self.capture_screenshots else {}
+        
+        data = self._extract(self.driver.page_source, self.driver.current_url)
+        data['screenshots'] = screenshots
+        data['wait_time'] = readiness['wait_time']
+        data['fetch_mode'] = 'browser'
+        return data
+
+    def _extract(self, page_source: str, page_url: str) -> dict:
+        """Pull page content out of the rendered HTML"""
+        if settings.extraction_engine == 'soup':
+            return self._extract_with_soup(page_source, page_url)
+        with metrics.span('scrape.extract'):
+            return extract(page_source, page_url)
+
+    def _extract_with_soup(self, page_source: str, page_url: str) -> dict:
+        """Reference extractors: one BeautifulSoup traversal per field"""
+        with metrics.span('scrape.extract.parse'):
+            soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Get title from multiple sources
+        with metrics.span('scrape.extract.title'):
+            title = self._get_title(soup)
+        if not title:
+            h1 = soup.find('h1')
+            if h1:
+                title = h1.text.strip()
+            else:
+                meta_title = soup.find('meta', {'property': 'og:title'})
+                if meta_title:
+                    title = meta_title.get('content', '').strip()
+        
+        # Get description from multiple sources
+        with metrics.span('scrape.extract.description'):
+            description = self._get_description(soup)
+        if not description:
+            meta_desc = soup.find('meta', {'property': 'og:description'})
+            if meta_desc:
+                description = meta_desc.get('content', '').strip()
+        
+        # Get all content
+        extractors = {
+            'main_content': lambda: self._get_main_content(soup),
+            'images': lambda: self._get_images(soup, page_url),
+            'sections': lambda: self._get_sections(soup),
+            'features': lambda: self._get_features(soup, page_url),
+            'colors': lambda: self._get_colors(soup),
+        }
+        data = {'title': title, 'description': description}
+        for name, extractor in extractors.items():
+            with metrics.span(f'scrape.extract.{name}'):
+                data[name] = extractor()
+        return data
 
     def _get_title(self, soup):
         title = soup.find('title')
         if title:
-            title_text = title.text.strip()
-            print(f"Found title: {title_text}")
-            return title_text
+            return title.text.strip()
         return ''
 
     def _get_description(self, soup):
         meta_desc = soup.find('meta', {'name': 'description'})
         if meta_desc and meta_desc.get('content'):
-            desc = meta_desc.get('content').strip()
-            print(f"Found description: {desc}")
-            return desc
+            return meta_desc.get('content').strip()
         return ''
 
     def _get_main_content(self, soup):
@@ -104,51 +204,105 @@ class WebsiteScraper:
                     break
         return content_text
 
-    def _get_images(self, soup):
+    def _get_images(self, soup, page_url: str):
         images = []
         for img in soup.find_all('img'):
             src = img.get('src')
             if src:
-                if not src.startswith('http'):
-                    if src.startswith('//'):
-                        src = f"https:{src}"
-                    elif src.startswith('/'):
-                        src = f"https://{self.driver.current_url.split('/')[2]}{src}"
-                    else:
-                        src = f"https://{self.driver.current_url.split('/')[2]}/{src}"
-                print(f"Found image: {src}")
-                images.append(src)
+                images.append(resolve_image_url(src, page_url))
         return images
 
     def _take_screenshots(self) -> dict:
-        screenshots = {}
-        
-        # Full page screenshot
-        full_path = os.path.join(self.screenshots_dir, "full_page.png")
-        self.driver.save_screenshot(full_path)
-        screenshots['full'] = full_path
+        """Capture the page as PNG bytes: the full scroll height, the first screen and the hero"""
+        with metrics.span('scrape.screenshot'):
+            return self._capture_screenshots()
+
+    def _capture_screenshots(self) -> dict:
+        screenshots = {'full': self._capture_full_page()}
         
         # Above the fold screenshot
-        fold_path = os.path.join(self.screenshots_dir, "above_fold.png")
         self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
-        self.driver.save_screenshot(fold_path)
-        screenshots['above_fold'] = fold_path
+        self._wait_for_paint()
+        screenshots['above_fold'] = self.driver.get_screenshot_as_png()
         
-        # Try to get hero section if exists
-        try:
-            hero = self.driver.find_element(By.CLASS_NAME, 'hero') or \
-                   self.driver.find_element(By.ID, 'hero') or \
-                   self.driver.find_element(By.TAG_NAME, 'header')
-            
-            hero_path = os.path.join(self.screenshots_dir, "hero.png")
-            hero.screenshot(hero_path)
-            screenshots['hero'] = hero_path
-        except:
-            pass
+        # Hero section, trying each locator in turn
+        hero = self._find_hero()
+        if hero is not None:
+            try:
+                screenshots['hero'] = hero.screenshot_as_png
+            except WebDriverException:
+                pass
         
         return screenshots
 
+    def _find_hero(self):
+        for by, value in HERO_LOCATORS:
+            elements = self.driver.find_elements(by, value)
+            if elements:
+                return elements[0]
+        return None
+
+    def _capture_full_page(self) -> bytes:
+        """Whole-page screenshot through CDP, falling back to stitching viewport captures"""
+        try:
+            layout_metrics = self.driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+            content = layout_metrics.get('cssContentSize') or layout_metrics['contentSize']
+            layout = layout_metrics.get('cssLayoutViewport') or layout_metrics['layoutViewport']
+            result = self.driver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'png',
+                'captureBeyondViewport': True,
+                'clip': {
+                    'x': 0,
+                    'y': 0,
+                    'width': layout['clientWidth'],
+                    'height': min(math.ceil(content['height']), MAX_CAPTURE_HEIGHT),
+                    'scale': 1,
+                },
+            })
+            return base64.b64decode(result['data'])
+        except (WebDriverException, KeyError) as e:
+            print(f"CDP full-page capture failed, stitching instead: {str(e)}")
+            return self._stitch_full_page()
+
+    def _stitch_full_page(self) -> bytes:
+        """Scroll one viewport at a time and paste the captures into one image"""
+        total_height, viewport_height = self.driver.execute_script(
+            "var root = document.documentElement || document.body;"
+            "return [root ? root.scrollHeight : 0, window.innerHeight];"
+        )
+        total_height = min(total_height or 0, MAX_CAPTURE_HEIGHT)
+        page = None
+        offset = 0
+        previous = -1
+        while offset < total_height:
+            self.driver.execute_script("window.scrollTo(0, arguments[0]);", offset)
+            self._wait_for_paint()
+            # The last scroll is clamped by the browser, so paste where it actually landed
+            scrolled = self.driver.execute_script("return window.scrollY;")
+            if scrolled <= previous:
+                break
+            shot = Image.open(io.BytesIO(self.driver.get_screenshot_as_png()))
+            scale = shot.size[1] / viewport_height
+            if page is None:
+                page = Image.new('RGB', (shot.size[0], int(total_height * scale)))
+            page.paste(shot.convert('RGB'), (0, int(scrolled * scale)))
+            previous = scrolled
+            offset = scrolled + viewport_height
+        
+        if page is None:
+            # Nothing to scroll through (no <body>, or an empty one): the viewport is the page
+            return self.driver.get_screenshot_as_png()
+        output = io.BytesIO()
+        page.save(output, format='PNG', compress_level=1)
+        return output.getvalue()
+
+    def _wait_for_paint(self):
+        """Block until the browser has painted at least one frame after a scroll"""
+        self.driver.execute_async_script(
+            "var done = arguments[arguments.length - 1];"
+            "requestAnimationFrame(function () { requestAnimationFrame(done); });"
+        )
+
     def _get_sections(self, soup) -> list:
         sections = []
         for section in soup.find_all(['section', 'div']):
@@ -163,7 +317,7 @@ class WebsiteScraper:
                     })
         return sections
 
-    def _get_features(self, soup) -> list:
+    def _get_features(self, soup, page_url: str) -> list:
         features = []
         feature_identifiers = [
             'feature', 'benefit', 'service', 'product',
@@ -174,10 +328,11 @@ class WebsiteScraper:
             classes = ' '.join(feature.get('class', [])).lower()
             if any(id in classes for id in feature_identifiers):
                 title_elem = feature.find(['h1', 'h2', 'h3', 'h4'])
+                img = feature.find('img')
                 features.append({
                     'title': title_elem.text.strip() if title_elem else '',
                     'description': feature.get_text(strip=True),
-                    'image': feature.find('img').get('src') if feature.find('img') else None
+                    'image': resolve_image_url(img.get('src'), page_url) if img and img.get('src') else None
                 })
         return features
 
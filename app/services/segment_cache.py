@@ -0,0 +1,97 @@
+# app/services/segment_cache.py
+
+from app.core.config import settings
+import hashlib
+import json
+import os
+import threading
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(source) -> str:
+    """SHA-256 of in-memory bytes, or of the file at a path"""
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    return file_digest(source)
+
+
+def evict_lru(cache_dir: str, max_bytes: int, suffix: str):
+    """Remove the least recently used ``suffix`` files until the directory fits in ``max_bytes``.
+
+    Recency is the file's mtime, which cache hits refresh.
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(suffix):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+class SegmentCache:
+    """On-disk store of encoded segments, addressed by a hash of their inputs.
+
+    Entries are plain files named after their key. A hit refreshes the
+    file's mtime, and eviction removes the least recently used files once
+    the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or settings.segment_cache_dir
+        self.max_bytes = max_bytes or settings.segment_cache_max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # Generators, and this cache with them, must survive a pickle to another process
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(**inputs) -> str:
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def get(self, key: str) -> str:
+        """Path of the cached segment, or None on a miss"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, source_path: str) -> str:
+        """Move a freshly encoded segment into the cache and return its new path"""
+        path = self._path(key)
+        os.replace(source_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        with self._lock:
+            evict_lru(self.cache_dir, self.max_bytes, '.mp4')
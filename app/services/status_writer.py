@@ -0,0 +1,132 @@
+# app/services/status_writer.py
+
+from sqlalchemy import update
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import FINAL_STATUSES, Video, VideoStatus
+import asyncio
+import threading
+
+FINAL_VALUES = {status.value for status in FINAL_STATUSES}
+
+
+class StatusWriter:
+    """Coalesces job status and progress updates into batched writes.
+
+    Updates may come from any thread. They are merged per video until the
+    next flush, so a job that changes stage and reports progress several
+    times between flushes costs a single row update. Every video changed
+    in a flush is written in one transaction. A video that already has a
+    final status is never changed again.
+    """
+
+    def __init__(self, session_factory=None, interval: float = None):
+        self.session_factory = session_factory or SessionLocal
+        self.interval = settings.status_flush_interval if interval is None else interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._loop = None
+        self._wake = None
+        self._flush_lock = None
+        self._task = None
+        self._stats = {'updates': 0, 'flushes': 0, 'rows': 0, 'errors': 0}
+
+    def start(self):
+        """Start flushing on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Write whatever is pending and stop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def submit(self, video_id: int, fields: dict):
+        """Queue new values for a video's columns; thread-safe"""
+        with self._lock:
+            pending = self._pending.setdefault(video_id, {})
+            # Never let a late stage update replace a final status waiting to be written
+            if pending.get('status') in FINAL_VALUES and fields.get('status') not in FINAL_VALUES:
+                fields = {name: value for name, value in fields.items() if name != 'status'}
+            pending.update(fields)
+            self._stats['updates'] += 1
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            # Let more updates arrive, then write them together
+            await asyncio.sleep(self.interval)
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write all pending updates in one transaction"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                async with self.session_factory() as db:
+                    async with db.begin():
+                        for video_id, fields in batch.items():
+                            await db.execute(
+                                update(Video)
+                                .where(Video.id == video_id, Video.status.not_in(FINAL_STATUSES))
+                                .values(**self._columns(fields))
+                            )
+            except Exception as e:
+                print(f"Error writing job status: {str(e)}")
+                self._requeue(batch)
+                with self._lock:
+                    self._stats['errors'] += 1
+                return
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['rows'] += len(batch)
+
+    def _columns(self, fields: dict) -> dict:
+        values = {name: value for name, value in fields.items() if hasattr(Video, name)}
+        if 'status' in values:
+            values['status'] = VideoStatus(values['status'])
+        return values
+
+    def _requeue(self, batch: dict):
+        """Put back a failed batch under anything submitted since"""
+        with self._lock:
+            for video_id, fields in batch.items():
+                newer = self._pending.get(video_id, {})
+                self._pending[video_id] = {**fields, **newer}
+        if self._wake is not None:
+            self._wake.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_status_writer() -> StatusWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = StatusWriter()
+        return _writer
@@ -0,0 +1,107 @@
+# app/services/text_renderer.py
+
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+import threading
+
+
+@lru_cache(maxsize=64)
+def load_font(font: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font once per (font, size); falls back to Pillow's bundled font"""
+    try:
+        return ImageFont.truetype(font, size)
+    except (OSError, TypeError):
+        return ImageFont.load_default(size)
+
+
+def resolve_font_path(font: str) -> str:
+    """Absolute path of a font file name, or the name unchanged if it cannot be found"""
+    try:
+        return ImageFont.truetype(font, 10).path
+    except (OSError, TypeError, AttributeError):
+        return font
+
+
+def wrap_text(text: str, font, max_width: int) -> list:
+    """Greedy word wrap to ``max_width`` pixels, splitting words that do not fit on a line"""
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if font.getlength(candidate) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while font.getlength(word) > max_width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and font.getlength(word[:cut]) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+class TextRenderer:
+    """In-process text to RGBA rendering, a stand-in for ImageMagick captions.
+
+    Rendered images are kept in an LRU keyed by everything that affects
+    the pixels, so repeated strings (outro text, re-renders) are free.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, text: str, font: str, fontsize: int, color='white',
+               width: int = None, align: str = 'center') -> np.ndarray:
+        """RGBA array of ``text``; with ``width`` it wraps like method='caption'"""
+        key = (text, font, fontsize, color, width, align)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        image = self._draw(text, load_font(font, fontsize), color, width, align)
+        image.flags.writeable = False
+        with self._lock:
+            self._cache[key] = image
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return image
+
+    def _draw(self, text, font, color, width, align) -> np.ndarray:
+        ascent, descent = font.getmetrics()
+        line_height = ascent + descent
+        lines = wrap_text(text, font, width) if width else [' '.join(text.split())]
+        line_widths = [int(np.ceil(font.getlength(line))) for line in lines]
+        canvas_width = width or max(max(line_widths), 1)
+        canvas = Image.new('RGBA', (canvas_width, max(line_height * len(lines), 1)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(canvas)
+        for index, (line, line_width) in enumerate(zip(lines, line_widths)):
+            if align == 'center':
+                x = (canvas_width - line_width) // 2
+            elif align == 'right':
+                x = canvas_width - line_width
+            else:
+                x = 0
+            draw.text((x, index * line_height), line, font=font, fill=color)
+        return np.asarray(canvas)
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_text_renderer() -> TextRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = TextRenderer()
+        return _renderer
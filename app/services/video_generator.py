@@ -1,65 +1,395 @@
 # app/services/video_generator.py
 
-from moviepy.editor import TextClip, ImageClip, ColorClip, CompositeVideoClip, concatenate_videoclips
-from moviepy.video.fx.resize import resize
+# The clip classes straight from their modules: moviepy.editor also loads
+# every effect, the audio stack and IPython display hooks
+from moviepy.video.VideoClip import ColorClip, ImageClip, TextClip, VideoClip
+from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+from app.services.encoder import FrameSink, concat_segments, encode_frames, encode_still
+from app.services.render_profiles import BASE_HEIGHT, get_render_profile
+from app.services.segment_cache import SegmentCache, content_digest
+from app.services.text_renderer import get_text_renderer, resolve_font_path
+from app.core import metrics
+from app.core.config import settings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import hashlib
+import io
+import multiprocessing
 import os
+import tempfile
+import threading
 import numpy as np
 from PIL import Image
 from PIL.Image import Resampling
 
+# A planned piece of the video: the builder method and its arguments
+Segment = namedtuple('Segment', ['name', 'builder', 'args', 'duration'])
+
+# Segments whose first frame makes the best poster, in order of preference;
+# a video has at most one of each
+POSTER_SEGMENTS = ('showcase', 'tour', 'intro')
+POSTER_MAX_WIDTH = 1280
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def poster_path(video_path: str) -> str:
+    """Where the poster image of a rendered video is stored"""
+    return os.path.splitext(video_path)[0] + '.jpg'
+
+
+def _get_render_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all renders in this process, kept warm between videos"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None or _render_pool._max_workers != workers:
+            if _render_pool is not None:
+                _render_pool.shutdown(wait=False)
+            _render_pool = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return _render_pool
+
+
+def _encode_segment(options: tuple, poster_segment: str, segment, segment_path: str):
+    """Pool entry point: build and encode one segment.
+
+    Only the generator's settings are sent, not the generator itself.
+    Stage timings and the poster image, if this segment provides it, are
+    returned with the path for the caller to use in its own process.
+    """
+    generator = _segment_encoder(*options)
+    generator._poster_segment = poster_segment
+    generator._poster = None
+    with metrics.capture() as observations:
+        path = generator._encode_segment(segment, segment_path)
+    return path, observations, generator._poster
+
+
+@lru_cache(maxsize=4)
+def _segment_encoder(profile: str, still_segments: bool, text_renderer: str, font: str,
+                     cache_dir: str) -> 'VideoGenerator':
+    """A pool worker's generator for one set of settings, reused for every segment it encodes"""
+    generator = VideoGenerator(still_segments=still_segments, render_workers=1, profile=profile,
+                               segment_cache=SegmentCache(cache_dir))
+    generator.text_renderer = text_renderer
+    generator.font = font
+    return generator
+
+
+def _ease_scroll(progress: float) -> float:
+    """Scroll position for a page tour: rest at the top and bottom, smoothstep in between"""
+    hold = 0.15
+    x = min(max((progress - hold) / (1 - 2 * hold), 0.0), 1.0)
+    return x * x * (3 - 2 * x)
+
 class VideoGenerator:
-    def __init__(self):
+    def __init__(self, still_segments: bool = True, render_mode: str = None, render_workers: int = None,
+                 segment_cache: SegmentCache = None, profile: str = None, on_progress=None):
         self.output_dir = "output"
-        self.width = 1920
-        self.height = 1080
+        self.profile = get_render_profile(profile)
+        self.width = self.profile.width
+        self.height = self.profile.height
+        self.fps = self.profile.fps
+        self.codec = 'libx264'
+        # Layout constants below are in 1080p pixels; scale them to the profile's height
+        self.scale = self.height / BASE_HEIGHT
         self.duration = {
             'intro': 5,
             'screenshot': 6,
+            'tour': 8,
             'feature': 4,
-            'text': 4
+            'text': 4,
+            'outro': 5
         }
+        self.font = resolve_font_path(settings.text_font)
+        # 'pillow' renders text in-process, 'imagemagick' uses MoviePy's TextClip
+        self.text_renderer = settings.text_renderer
+        self.font_sizes = {
+            'title': self._px(70),
+            'description': self._px(40),
+            'feature_title': self._px(60),
+            'feature_description': self._px(36),
+            'outro': self._px(60)
+        }
+        self.max_features = 3
+        # Page tours scroll through at most this many screens of the page
+        self.max_tour_screens = 10
+        # Box a feature image is fitted into, above the feature title
+        self.feature_image_size = (self._px(900), self._px(260))
+        # Static segments are composited once and encoded as a held frame
+        self.still_segments = still_segments
+        # 'parallel' encodes segments in a process pool, 'single' is one MoviePy pass
+        self.render_mode = render_mode or settings.render_mode
+        self.render_workers = render_workers or settings.render_workers
+        self.segment_cache = segment_cache or SegmentCache()
+        # Called with (frames_done, total_frames) as frames are encoded
+        self.on_progress = on_progress
+        self._frames_done = 0
+        self._total_frames = 0
+        # JPEG of an already composited frame, kept while rendering for the poster,
+        # and the name of the segment it comes from
+        self._poster_segment = None
+        self._poster = None
         os.makedirs(self.output_dir, exist_ok=True)
 
+    def __getstate__(self):
+        # A copy in another process gets no callback; progress is reported where it was set
+        state = self.__dict__.copy()
+        state['on_progress'] = None
+        return state
+
     def generate(self, content: dict) -> str:
         """Main method to generate the video"""
         try:
-            clips = []
-            
-            # Use default values if content is missing
-            title = content.get('title', 'Website Preview').strip()
-            description = content.get('description', 'Explore our website').strip()
-            
-            # Create intro
-            intro = self._create_intro(title, description)
-            clips.append(intro)
-            
-            # Add screenshots if available
-            if content.get('screenshots', {}).get('full'):
-                showcase = self._create_website_showcase(content['screenshots']['full'])
-                clips.append(showcase)
-            
-            # Add outro
-            outro = self._create_outro()
-            clips.append(outro)
-            
-            # Combine clips and create video
-            final_video = concatenate_videoclips(clips)
-            output_path = os.path.join(self.output_dir, f"promo_{abs(hash(title))}.mp4")
-            
-            # Write video file
-            final_video.write_videofile(
-                output_path,
-                fps=24,
-                codec='libx264',
-                audio=False
-            )
-            
-            return output_path
-            
+            with metrics.span('render.total'):
+                return self._generate(content)
         except Exception as e:
             print(f"Error details: {str(e)}")
             raise Exception(f"Error generating video: {str(e)}")
 
+    def _generate(self, content: dict) -> str:
+        segments = self._plan_segments(content)
+        keys = [self._segment_key(segment) for segment in segments]
+        
+        # Name the output after its inputs so identical renders map to the same file
+        video_key = hashlib.sha256(''.join(keys).encode()).hexdigest()[:16]
+        output_path = os.path.join(self.output_dir, f"promo_{video_key}.mp4")
+        names = {segment.name for segment in segments}
+        self._poster_segment = next((name for name in POSTER_SEGMENTS if name in names), None)
+        self._poster = None
+        if os.path.exists(output_path):
+            self._write_poster(output_path, segments)
+            return output_path
+        
+        # Render under a temporary name: a failed render never leaves a partial
+        # file at output_path, and concurrent renders of it do not write into each other
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=f".promo_{video_key}.", suffix='.mp4')
+        os.close(fd)
+        try:
+            if self.render_mode == 'single':
+                self._render_composite(segments, tmp_path)
+            else:
+                self._render_segments(segments, keys, tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, output_path)
+        
+        self._write_poster(output_path, segments)
+        return output_path
+
+    def _keep_poster(self, segment: Segment, frame):
+        """Keep a frame being encoded anyway as the poster, if it is the poster segment's first"""
+        if self._poster is not None or segment.name != self._poster_segment:
+            return
+        img = Image.fromarray(np.asarray(frame[:, :, :3], dtype=np.uint8))
+        if img.width > POSTER_MAX_WIDTH:
+            img = img.resize((POSTER_MAX_WIDTH, round(img.height * POSTER_MAX_WIDTH / img.width)),
+                             Resampling.BILINEAR)
+        output = io.BytesIO()
+        img.save(output, format='JPEG', quality=85, progressive=True)
+        self._poster = output.getvalue()
+
+    def _write_poster(self, video_path: str, segments: list):
+        """Save the poster next to the video.
+
+        When the poster segment came from the segment cache no frame of it
+        was composited, so its first frame is composited now (not decoded).
+        """
+        path = poster_path(video_path)
+        if os.path.exists(path) or self._poster_segment is None:
+            return
+        if self._poster is None:
+            segment = next(segment for segment in segments if segment.name == self._poster_segment)
+            clip = self._build_clip(segment)
+            if clip is None:
+                return
+            self._keep_poster(segment, clip.get_frame(0))
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.jpg')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self._poster)
+        os.replace(tmp_path, path)
+
+    def _plan_segments(self, content: dict) -> list:
+        """Decide which segments make up the video, in order"""
+        title = content.get('title', 'Website Preview').strip()
+        description = content.get('description', 'Explore our website').strip()
+        
+        segments = [Segment('intro', '_create_intro', (title, description), self.duration['intro'])]
+        
+        # Add screenshots if available (a path or PNG bytes); pages taller than the frame get a scrolling tour
+        screenshot = content.get('screenshots', {}).get('full')
+        if screenshot and self._is_tall(screenshot):
+            segments.append(Segment('tour', '_create_page_tour', (screenshot,), self.duration['tour']))
+        elif screenshot:
+            segments.append(Segment('showcase', '_create_website_showcase',
+                                    (screenshot,), self.duration['screenshot']))
+        
+        assets = content.get('assets', {})
+        for feature in self._planned_features(content):
+            segments.append(Segment('feature', '_create_feature',
+                                    (feature['title'], feature.get('description', ''),
+                                     assets.get(feature.get('image'))),
+                                    self.duration['feature']))
+        
+        segments.append(Segment('outro', '_create_outro', (), self.duration['outro']))
+        return segments
+
+    def _planned_features(self, content: dict) -> list:
+        return [feature for feature in content.get('features', [])[:self.max_features] if feature.get('title')]
+
+    def image_urls(self, content: dict) -> list:
+        """Images the video would show, to be fetched into ``content['assets']`` before ``generate``"""
+        return [feature['image'] for feature in self._planned_features(content) if feature.get('image')]
+
+    def _build_clip(self, segment: Segment):
+        with metrics.span(f"render.{segment.builder.lstrip('_')}"):
+            return getattr(self, segment.builder)(*segment.args)
+
+    def _segment_key(self, segment: Segment) -> str:
+        """Cache key covering everything that affects a segment's encoded bytes"""
+        args = list(segment.args)
+        if segment.name in ('showcase', 'tour'):
+            args[0] = content_digest(args[0])
+        return SegmentCache.key(
+            builder=segment.builder,
+            args=args,
+            duration=segment.duration,
+            size=(self.width, self.height),
+            fps=self.fps,
+            codec=self.codec,
+            preset=self.profile.preset,
+            crf=self.profile.crf,
+            font=self.font,
+            font_sizes=self.font_sizes,
+            text_renderer=self.text_renderer,
+            still=self._is_still(segment)
+        )
+
+    def _render_segments(self, segments: list, keys: list, output_path: str):
+        """Encode every uncached segment separately, in parallel, then join them without re-encoding"""
+        paths = [self.segment_cache.get(key) for key in keys]
+        missing = [index for index, path in enumerate(paths) if path is None]
+        metrics.SEGMENTS_TOTAL.inc(len(paths) - len(missing), cache='hit')
+        metrics.SEGMENTS_TOTAL.inc(len(missing), cache='miss')
+        
+        with tempfile.TemporaryDirectory(dir=self.output_dir) as tmp_dir:
+            todo = [segments[index] for index in missing]
+            tmp_paths = [os.path.join(tmp_dir, f"{index:02d}_{segments[index].name}.mp4") for index in missing]
+            self._start_progress(todo)
+            workers = min(self.render_workers, len(todo))
+            if workers > 1:
+                pool = _get_render_pool(self.render_workers)
+                options = (self.profile.name, self.still_segments, self.text_renderer, self.font,
+                           self.segment_cache.cache_dir)
+                futures = {pool.submit(_encode_segment, options, self._poster_segment, segment, path): position
+                           for position, (segment, path) in enumerate(zip(todo, tmp_paths))}
+                results = [None] * len(todo)
+                # Pool workers cannot call back, so progress moves a whole segment at a time
+                for future in as_completed(futures):
+                    position = futures[future]
+                    results[position], observations, poster = future.result()
+                    metrics.replay(observations)
+                    self._poster = self._poster or poster
+                    self._advance(self._segment_frames(todo[position]))
+            else:
+                results = [self._encode_segment(segment, path) for segment, path in zip(todo, tmp_paths)]
+            
+            for index, result in zip(missing, results):
+                if result:
+                    paths[index] = self.segment_cache.put(keys[index], result)
+            with metrics.span('render.concat'):
+                concat_segments([path for path in paths if path], output_path, faststart=True)
+
+    def _encode_segment(self, segment: Segment, segment_path: str) -> str:
+        """Build one segment and encode it with the shared codec settings"""
+        clip = self._build_clip(segment)
+        if clip is None:
+            self._advance(self._segment_frames(segment))
+            return None
+        # For moving segments this includes compositing, which runs as frames are pulled
+        with metrics.span('render.encode'):
+            if self._is_still(segment):
+                frame = clip.get_frame(0)
+                self._keep_poster(segment, frame)
+                encode_still(frame, segment.duration, segment_path,
+                             fps=self.fps, codec=self.codec, **self._encoder_options())
+                self._advance(self._segment_frames(segment))
+            else:
+                frames = clip.set_duration(segment.duration).iter_frames(fps=self.fps, dtype='uint8')
+                encode_frames(self._counted(frames, segment), (self.width, self.height), segment_path,
+                              fps=self.fps, codec=self.codec, **self._encoder_options())
+        return segment_path
+
+    def _segment_frames(self, segment: Segment) -> int:
+        return round(segment.duration * self.fps)
+
+    def _start_progress(self, segments: list):
+        self._frames_done = 0
+        self._total_frames = sum(self._segment_frames(segment) for segment in segments)
+        self._advance(0)
+
+    def _advance(self, frames: int):
+        self._frames_done += frames
+        if self.on_progress is not None:
+            self.on_progress(self._frames_done, self._total_frames)
+
+    def _counted(self, frames, segment: Segment):
+        """Pass frames through, reporting each one as it goes to the encoder"""
+        for index, frame in enumerate(frames):
+            if index == 0:
+                self._keep_poster(segment, frame)
+            yield frame
+            self._advance(1)
+
+    def _is_still(self, segment: Segment) -> bool:
+        """Whether a segment is encoded as one held frame; page tours always move"""
+        return self.still_segments and segment.name != 'tour'
+
+    def _encoder_options(self) -> dict:
+        return {'preset': self.profile.preset, 'crf': self.profile.crf, 'threads': self.profile.threads}
+
+    def _px(self, value: int) -> int:
+        """A 1080p layout measurement scaled to the output height"""
+        return max(1, round(value * self.scale))
+
+    def _render_composite(self, segments: list, output_path: str):
+        """Composite every segment in order and stream the frames into one ffmpeg process.
+
+        Clips are built one at a time, so only the current segment is held in
+        memory; a still segment's frame is composited once and written repeatedly.
+        """
+        self._start_progress(segments)
+        with FrameSink((self.width, self.height), output_path, fps=self.fps, codec=self.codec,
+                       faststart=True, **self._encoder_options()) as sink:
+            for segment in segments:
+                clip = self._build_clip(segment)
+                if clip is None:
+                    self._advance(self._segment_frames(segment))
+                    continue
+                if self._is_still(segment):
+                    frame = clip.get_frame(0)
+                    self._keep_poster(segment, frame)
+                    sink.write(frame, repeat=self._segment_frames(segment))
+                    self._advance(self._segment_frames(segment))
+                else:
+                    frames = clip.set_duration(segment.duration).iter_frames(fps=self.fps, dtype='uint8')
+                    for frame in self._counted(frames, segment):
+                        sink.write(frame)
+
+    def _text_clip(self, text: str, fontsize: int, width: int = None):
+        """White text on a transparent background, wrapped to ``width`` when given"""
+        if self.text_renderer == 'imagemagick':
+            size = (width, None) if width else None
+            return TextClip(txt=text, fontsize=fontsize, font=self.font, color='white',
+                            size=size, method='caption')
+        with metrics.span('render.text'):
+            rgba = get_text_renderer().render(text, self.font, fontsize, color='white', width=width)
+        return ImageClip(rgba, transparent=True)
+
     def _create_intro(self, title: str, description: str) -> CompositeVideoClip:
         """Create intro clip with title and description"""
         # Create background
@@ -67,39 +397,27 @@ class VideoGenerator:
         bg = bg.set_duration(self.duration['intro'])
         
         # Create title clip
-        title_clip = (TextClip(
-            txt=title,
-            fontsize=70,
-            color='white',
-            size=(self.width-200, None),
-            method='caption'
-        ).set_position(('center', self.height//3))
-         .set_duration(self.duration['intro']))
+        title_clip = (self._text_clip(title, self.font_sizes['title'], width=self.width-self._px(200))
+                      .set_position(('center', self.height//3))
+                      .set_duration(self.duration['intro']))
         
         # Create description clip
-        desc_clip = (TextClip(
-            txt=description,
-            fontsize=40,
-            color='white',
-            size=(self.width-400, None),
-            method='caption'
-        ).set_position(('center', self.height//2 + 100))
-         .set_duration(self.duration['intro']))
+        desc_clip = (self._text_clip(description, self.font_sizes['description'], width=self.width-self._px(400))
+                     .set_position(('center', self.height//2 + self._px(100)))
+                     .set_duration(self.duration['intro']))
         
         return CompositeVideoClip([bg, title_clip, desc_clip])
 
-    def _create_website_showcase(self, screenshot_path: str) -> CompositeVideoClip:
+    def _create_website_showcase(self, screenshot) -> CompositeVideoClip:
         """Create clip showing website screenshot"""
         try:
             # Create background
             bg = ColorClip((self.width, self.height), color=(15, 15, 15))
             bg = bg.set_duration(self.duration['screenshot'])
             
-            # Load and process screenshot
-            img = Image.open(screenshot_path)
-            # Resize image while maintaining aspect ratio
-            img = self._resize_image(img, self.width-100)
-            img_clip = ImageClip(np.array(img))
+            # Load only the centered part of the page that fits on screen, at display size
+            img = self._load_screenshot(screenshot, self.width-self._px(100), max_height=self.height)
+            img_clip = ImageClip(np.asarray(img))
             
             # Position and set duration
             img_clip = img_clip.set_position('center')
@@ -111,23 +429,124 @@ class VideoGenerator:
             print(f"Error creating showcase: {str(e)}")
             return None
 
+    def _is_tall(self, screenshot) -> bool:
+        """Whether the screenshot, at showcase width, is clearly taller than the frame"""
+        try:
+            with self._open_image(screenshot) as img:
+                width, height = img.size
+        except (OSError, ValueError):
+            return False
+        return height * (self.width - self._px(100)) / width > self.height * 1.25
+
+    def _create_page_tour(self, screenshot) -> VideoClip:
+        """Scroll down a full-page screenshot.
+
+        The page is resized once, with the side margins baked in; every frame
+        is then a view into that array, so a frame costs the same however
+        tall the page is.
+        """
+        try:
+            target_width = self.width - self._px(100)
+            img = self._load_screenshot(screenshot, target_width,
+                                        max_height=self.height * self.max_tour_screens, align='top')
+            page = np.empty((max(img.size[1], self.height), self.width, 3), dtype=np.uint8)
+            page[:] = (15, 15, 15)
+            left = (self.width - img.size[0]) // 2
+            page[:img.size[1], left:left + img.size[0]] = np.asarray(img)
+            
+            travel = page.shape[0] - self.height
+            duration = self.duration['tour']
+            
+            def make_frame(t):
+                top = round(travel * _ease_scroll(t / duration))
+                return page[top:top + self.height]
+            
+            return VideoClip(make_frame, duration=duration)
+            
+        except Exception as e:
+            print(f"Error creating page tour: {str(e)}")
+            return None
+
+    def _open_image(self, source) -> Image:
+        """Open a path or in-memory PNG bytes; decoding is deferred until pixels are needed"""
+        if isinstance(source, bytes):
+            return Image.open(io.BytesIO(source))
+        return Image.open(source)
+
+    def _load_screenshot(self, screenshot, target_width: int, max_height: int = None,
+                         align: str = 'center') -> Image:
+        """Decode an image downsampled towards ``target_width`` as early as possible.
+
+        With ``max_height``, the image is cropped first (to its vertical center,
+        or its top with align='top') so rows that are never shown are never resized.
+        """
+        img = self._open_image(screenshot)
+        # JPEG decodes straight to 1/2, 1/4 or 1/8 scale; other formats ignore this
+        img.draft('RGB', (target_width, img.size[1] * target_width // img.size[0]))
+        if max_height:
+            window = int(max_height * img.size[0] / target_width)
+            if img.size[1] > window:
+                top = 0 if align == 'top' else (img.size[1] - window) // 2
+                img = img.crop((0, top, img.size[0], top + window))
+        img = img.convert('RGB')
+        # Cheap integer box reduction first, so LANCZOS only sees a near-final image
+        factor = img.size[0] // target_width
+        if factor > 1:
+            img = img.reduce(factor)
+        return self._resize_image(img, target_width)
+
     def _resize_image(self, img, target_width: int) -> Image:
         """Resize image maintaining aspect ratio"""
         ratio = target_width / float(img.size[0])
         target_height = int(float(img.size[1]) * float(ratio))
         return img.resize((target_width, target_height), Resampling.LANCZOS)
 
+    def _create_feature(self, title: str, description: str, image: str = None) -> CompositeVideoClip:
+        """Create a clip for one feature card, with its image above the title when there is one"""
+        bg = ColorClip((self.width, self.height), color=(20, 20, 30))
+        bg = bg.set_duration(self.duration['feature'])
+        
+        title_clip = (self._text_clip(title, self.font_sizes['feature_title'], width=self.width-self._px(200))
+                      .set_position(('center', self.height//3))
+                      .set_duration(self.duration['feature']))
+        clips = [bg, title_clip]
+        
+        if image:
+            image_clip = self._feature_image(image)
+            if image_clip is not None:
+                clips.append(image_clip)
+        
+        if description and description != title:
+            if len(description) > 200:
+                description = description[:197].rstrip() + '...'
+            desc_clip = (self._text_clip(description, self.font_sizes['feature_description'], width=self.width-self._px(400))
+                         .set_position(('center', self.height//2 + self._px(60)))
+                         .set_duration(self.duration['feature']))
+            clips.append(desc_clip)
+        
+        return CompositeVideoClip(clips)
+
+    def _feature_image(self, image_path: str) -> ImageClip:
+        """Thumbnail from the asset stage, bottom-aligned just above the feature title"""
+        try:
+            img = Image.open(image_path).convert('RGBA')
+        except OSError as e:
+            print(f"Error loading feature image: {str(e)}")
+            return None
+        # Thumbnails already fit the box; this only matters for a different profile's file
+        img.thumbnail(self.feature_image_size, Resampling.LANCZOS)
+        top = max(0, self.height//3 - self._px(30) - img.size[1])
+        return (ImageClip(np.asarray(img), transparent=True)
+                .set_position(('center', top))
+                .set_duration(self.duration['feature']))
+
     def _create_outro(self) -> CompositeVideoClip:
         """Create outro clip"""
         bg = ColorClip((self.width, self.height), color=(25, 25, 25))
-        bg = bg.set_duration(5)
-        
-        text_clip = (TextClip(
-            txt="Visit our website to learn more",
-            fontsize=60,
-            color='white',
-            method='caption'
-        ).set_position('center')
-         .set_duration(5))
+        bg = bg.set_duration(self.duration['outro'])
+        
+        text_clip = (self._text_clip("Visit our website to learn more", self.font_sizes['outro'])
+                     .set_position('center')
+                     .set_duration(self.duration['outro']))
         
         return CompositeVideoClip([bg, text_clip])
\ No newline at end of file
@@ -0,0 +1,68 @@
+# app/services/video_jobs.py
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.status import VideoStatus
+from app.services.job_queue import check_cancelled, emit, release_slot, report_progress
+from app.services.memory import PeakMemory
+from contextlib import nullcontext
+import time
+
+# Most encode progress updates a job sends per second
+PROGRESS_INTERVAL = 0.5
+
+
+class _ProgressReporter:
+    """Generator progress callback: throttles updates and estimates the time left"""
+
+    def __init__(self, video_id: int, interval: float = PROGRESS_INTERVAL):
+        self.video_id = video_id
+        self.interval = interval
+        self.started = time.monotonic()
+        self.reported = 0.0
+
+    def __call__(self, frames: int, total_frames: int):
+        now = time.monotonic()
+        done = frames >= total_frames
+        if not done and now - self.reported < self.interval:
+            return
+        self.reported = now
+        elapsed = now - self.started
+        eta = elapsed / frames * (total_frames - frames) if frames else None
+        report_progress(self.video_id, frames=frames, total_frames=total_frames,
+                        eta_seconds=round(eta, 1) if eta is not None else None)
+
+
+def run_video_job(video_id: int, website_url: str, force_refresh: bool = False, profile: str = None,
+                  profile_job: bool = False) -> dict:
+    """Scrape and render one video; runs inside a worker process.
+
+    With ``profile_job`` (honoured only when ALLOW_PROFILING is set) the job
+    runs under cProfile and the stats land in PROFILE_DIR.
+    """
+    # Scraping and rendering pull in Selenium, MoviePy and NumPy; the API
+    # process imports this module only to submit jobs
+    from app.services.assets import AssetFetcher
+    from app.services.scraper import WebsiteScraper
+    from app.services.video_generator import VideoGenerator
+
+    profiling = profile_job and settings.allow_profiling
+    with PeakMemory() as memory, (metrics.profile(f"video_{video_id}") if profiling else nullcontext()):
+        check_cancelled(video_id)
+        emit(video_id, VideoStatus.SCRAPING.value)
+        with metrics.span('job.scrape'):
+            content = WebsiteScraper(in_memory_screenshots=True).scrape(website_url, force_refresh=force_refresh)
+        generator = VideoGenerator(profile=profile)
+        with metrics.span('job.assets'):
+            content['assets'] = AssetFetcher().fetch(generator.image_urls(content), generator.feature_image_size)
+        # Done with the website: let the scheduler start another scrape of it
+        release_slot(video_id)
+
+        check_cancelled(video_id)
+        emit(video_id, VideoStatus.RENDERING.value)
+        generator.on_progress = _ProgressReporter(video_id)
+        with metrics.span('job.render'):
+            output_path = generator.generate(content)
+
+    print(f"Job {video_id} peak memory: {memory.peak_mb} MB")
+    return {'output_path': output_path, 'peak_memory_mb': memory.peak_mb}
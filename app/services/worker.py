@@ -0,0 +1,52 @@
+# app/services/worker.py
+
+from app.core.config import settings
+import importlib
+import time
+
+# Imported by every video job; loading them up front keeps that cost out of the first job
+PREWARM_MODULES = (
+    'numpy',
+    'PIL.Image',
+    'moviepy.video.VideoClip',
+    'moviepy.video.compositing.CompositeVideoClip',
+    'app.services.video_generator',
+    'app.services.scraper',
+    'app.services.assets',
+    'app.services.video_jobs',
+)
+
+
+def prewarm(browser: bool = None) -> dict:
+    """Import the job modules and optionally start a pooled browser.
+
+    Returns seconds spent per step. A browser that fails to start is
+    reported and skipped; the first scrape will try again.
+    """
+    browser = settings.worker_prewarm_browser if browser is None else browser
+    timings = {}
+    for name in PREWARM_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = time.perf_counter() - start
+    if browser:
+        from app.services.driver_pool import get_driver_pool
+        start = time.perf_counter()
+        pool = get_driver_pool()
+        try:
+            # Straight back into the pool, warm for the first scrape
+            pool.release(pool.acquire())
+            timings['browser'] = time.perf_counter() - start
+        except Exception as e:
+            print(f"Browser prewarm failed: {str(e)}")
+    return timings
+
+
+def ready() -> bool:
+    """No-op job; submitted once per worker so the pool starts them straight away"""
+    return True
+
+
+if __name__ == "__main__":
+    for step, seconds in prewarm().items():
+        print(f"{step:<48} {1000 * seconds:8.1f} ms")
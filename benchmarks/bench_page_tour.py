@@ -0,0 +1,42 @@
+# benchmarks/bench_page_tour.py
+"""Time page-tour frame generation for pages of increasing height.
+
+Run from the repository root: python -m benchmarks.bench_page_tour
+The one-off load grows with the page; the per-frame cost should not.
+"""
+
+from app.services.video_generator import VideoGenerator
+from PIL import Image
+import os
+import tempfile
+import time
+
+PAGE_HEIGHTS = [2000, 6000, 12000]
+
+
+def _make_page(path: str, height: int):
+    img = Image.new('RGB', (1920, height), (240, 240, 240))
+    for y in range(0, height, 60):
+        img.paste((30 + y % 200, 90, 160), (100, y, 1820, y + 30))
+    img.save(path)
+
+
+def main():
+    generator = VideoGenerator()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for height in PAGE_HEIGHTS:
+            path = os.path.join(tmp_dir, f"page_{height}.png")
+            _make_page(path, height)
+
+            start = time.perf_counter()
+            clip = generator._create_page_tour(path)
+            loaded = time.perf_counter()
+            frames = sum(1 for _ in clip.iter_frames(fps=generator.fps, dtype='uint8'))
+            elapsed = time.perf_counter() - loaded
+
+            print(f"{height:>6}px: load {loaded - start:6.3f}s, "
+                  f"{elapsed / frames * 1e6:7.1f} us/frame over {frames} frames")
+
+
+if __name__ == "__main__":
+    main()
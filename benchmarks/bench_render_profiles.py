@@ -0,0 +1,41 @@
+# benchmarks/bench_render_profiles.py
+"""Time the same video under each render profile.
+
+Run from the repository root: python -m benchmarks.bench_render_profiles
+"""
+
+from app.services.render_profiles import RENDER_PROFILES
+from app.services.segment_cache import SegmentCache
+from app.services.video_generator import VideoGenerator
+from benchmarks.bench_still_segments import CONTENT, _make_screenshot
+import os
+import tempfile
+import time
+
+FEATURES = [
+    {'title': 'Dashboards', 'description': 'Every metric your team cares about, on one screen'},
+    {'title': 'Alerts', 'description': 'Know when something changes before your customers do'},
+]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        screenshot = os.path.join(tmp_dir, 'full_page.png')
+        _make_screenshot(screenshot)
+        content = dict(CONTENT, screenshots={'full': screenshot}, features=FEATURES)
+
+        for name in RENDER_PROFILES:
+            # A fresh cache per profile so every run encodes from scratch
+            cache = SegmentCache(os.path.join(tmp_dir, f"segments_{name}"))
+            generator = VideoGenerator(profile=name, render_workers=1, segment_cache=cache)
+            start = time.perf_counter()
+            output_path = generator.generate(content)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(output_path)
+            os.remove(output_path)
+            print(f"{name:<10} {generator.width}x{generator.height}@{generator.fps:<3} "
+                  f"{elapsed:6.2f}s {size / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_startup.py
+"""Cold-start cost of the API process and of a pre-warmed job worker.
+
+Run from the repository root: python -m benchmarks.bench_startup
+    --runs N          fresh interpreters per measurement (default 5)
+    --browser         also time launching the worker's browser (needs a local Chrome install)
+    --output PATH     also write the results as JSON
+
+Import times come from ``python -X importtime`` in a new interpreter each
+run, so nothing is served from an already-imported module.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules the API process should not load until a request needs them
+HEAVY_MODULES = ['selenium.webdriver', 'webdriver_manager', 'moviepy', 'numpy', 'PIL', 'bs4']
+TOP_MODULES = 10
+
+WORKER_SNIPPET = (
+    "import json, sys; from app.services.worker import prewarm; "
+    "print(json.dumps(prewarm(browser=sys.argv[1] == '1')))"
+)
+
+
+def import_times(module: str) -> dict:
+    """Parse ``-X importtime`` output for a fresh ``import module``"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # import time: <self us> | <cumulative us> | <indented module name>
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        cumulative[name.strip()] = (int(cumulative_us), depth)
+    # Top-level entries already include everything imported beneath them
+    total_us = sum(us for us, depth in cumulative.values() if depth == 0)
+    return {'wall': wall, 'import': total_us / 1e6, 'modules': cumulative}
+
+
+def bench_api_import(runs: int) -> dict:
+    samples = [import_times('main') for _ in range(runs)]
+    modules = samples[-1]['modules']
+    top = sorted(((name, us) for name, (us, depth) in modules.items() if name != 'main'),
+                 key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+    loaded = [name for name in HEAVY_MODULES
+              if any(module == name or module.startswith(name + '.') for module in modules)]
+    return {
+        'import_seconds': statistics.median(sample['import'] for sample in samples),
+        'wall_seconds': statistics.median(sample['wall'] for sample in samples),
+        'modules_loaded': len(modules),
+        'top_modules_ms': {name: round(us / 1000, 1) for name, us in top},
+        'heavy_modules_loaded': loaded,
+    }
+
+
+def bench_worker_prewarm(runs: int, browser: bool) -> dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', WORKER_SNIPPET, '1' if browser else '0'],
+                                capture_output=True, text=True, check=True)
+        steps = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append((time.perf_counter() - start, steps))
+    return {
+        'wall_seconds': statistics.median(wall for wall, _ in samples),
+        'prewarm_seconds': statistics.median(sum(steps.values()) for _, steps in samples),
+        'steps_ms': {step: round(1000 * statistics.median(s[step] for _, s in samples if step in s), 1)
+                     for step in samples[-1][1]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--browser', action='store_true')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    api = bench_api_import(args.runs)
+    print(f"API import: {1000 * api['import_seconds']:.0f} ms "
+          f"({1000 * api['wall_seconds']:.0f} ms wall, {api['modules_loaded']} modules)")
+    for name, ms in api['top_modules_ms'].items():
+        print(f"  {name:<48} {ms:8.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(api['heavy_modules_loaded']) or 'none'}")
+
+    worker = bench_worker_prewarm(args.runs, args.browser)
+    print(f"Worker prewarm: {1000 * worker['prewarm_seconds']:.0f} ms "
+          f"({1000 * worker['wall_seconds']:.0f} ms wall)")
+    for step, ms in worker['steps_ms'].items():
+        print(f"  {step:<48} {ms:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'api': api, 'worker': worker}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_still_segments.py
+"""Compare the still-segment fast path against full per-frame compositing.
+
+Run from the repository root: python -m benchmarks.bench_still_segments
+"""
+
+from app.services.video_generator import VideoGenerator
+from PIL import Image
+import os
+import tempfile
+import time
+
+CONTENT = {
+    'title': 'Benchmark Landing Page',
+    'description': 'A synthetic page used to time the render pipeline end to end',
+}
+
+
+def _make_screenshot(path: str):
+    img = Image.new('RGB', (1920, 1080), (240, 240, 240))
+    for y in range(0, 1080, 60):
+        img.paste((30 + y % 200, 90, 160), (100, y, 1820, y + 30))
+    img.save(path)
+
+
+def _time_generate(generator: VideoGenerator, content: dict) -> float:
+    start = time.perf_counter()
+    output_path = generator.generate(content)
+    elapsed = time.perf_counter() - start
+    os.remove(output_path)
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        screenshot = os.path.join(tmp_dir, 'full_page.png')
+        _make_screenshot(screenshot)
+        content = dict(CONTENT, screenshots={'full': screenshot})
+
+        composite = _time_generate(VideoGenerator(render_mode='single', still_segments=False), content)
+        still = _time_generate(VideoGenerator(render_workers=1), content)
+
+    print(f"Per-frame compositing: {composite:.2f}s")
+    print(f"Still segments:        {still:.2f}s")
+    print(f"Speedup:               {composite / still:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
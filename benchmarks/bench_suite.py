@@ -0,0 +1,333 @@
+# benchmarks/bench_suite.py
+"""Offline benchmark suite for scraping and rendering.
+
+Run from the repository root: python -m benchmarks.bench_suite
+    --output PATH     where to write the results (default benchmarks/results/<commit>.json)
+    --compare PATH    print how these results differ from an earlier run
+    --browser         also scrape in Chrome (needs a local Chrome install)
+    --profile NAME    render profile to time (default 'preview')
+
+Pages come from benchmarks/fixtures plus a generated page of deeply nested
+divs, served by a local HTTP server, so runs never touch the network.
+Stage timings are read from the same metrics spans the service exports.
+"""
+
+from app.core import metrics
+from app.services.assets import AssetFetcher, ThumbnailCache
+from app.services.driver_pool import DriverPool
+from app.services.extractor import extract
+from app.services.memory import PeakMemory
+from app.services.scrape_cache import ScrapeCache
+from app.services.scraper import WebsiteScraper
+from app.services.segment_cache import SegmentCache
+from app.services.video_generator import VideoGenerator
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+PAGES = ['static.html', 'nested.html', 'spa.html']
+# Timed runs per measurement; the median is reported
+REPEATS = 5
+# Shape of the generated page: sections of divs nested this deep
+NESTED_SECTIONS = 300
+NESTED_DEPTH = 80
+# Changes smaller than this are noise, not regressions
+COMPARE_THRESHOLD = 0.10
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _serve(directory: str) -> ThreadingHTTPServer:
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _nested_page() -> str:
+    """A page builders' worst case: every section buried under dozens of wrapper divs"""
+    sections = []
+    for n in range(NESTED_SECTIONS):
+        opening = ''.join(f'<div class="wrap-{depth}">' for depth in range(NESTED_DEPTH))
+        sections.append(
+            f'{opening}<div class="feature"><h3>Feature {n}</h3>'
+            f'<p>Description of feature {n}, long enough to count as real page copy.</p>'
+            f'<img src="/img/feature_{n % 3}.png"></div>{"</div>" * NESTED_DEPTH}'
+        )
+    return (
+        '<!DOCTYPE html><html><head><title>Nested Builder Page</title>'
+        '<meta name="description" content="Generated by a page builder that wraps everything."></head>'
+        f'<body><h1>Nested Builder Page</h1>{"".join(sections)}</body></html>'
+    )
+
+
+def _make_image(path: str, size: tuple, color: tuple):
+    img = Image.new('RGB', size, color)
+    for y in range(0, size[1], 40):
+        img.paste((255 - color[0], color[1], 200), (20, y, size[0] - 20, y + 16))
+    img.save(path)
+
+
+def _build_site(site_dir: str):
+    """Copy the fixtures and add the generated page and the images they reference"""
+    for name in os.listdir(FIXTURES_DIR):
+        shutil.copy(os.path.join(FIXTURES_DIR, name), site_dir)
+    with open(os.path.join(site_dir, 'nested.html'), 'w') as f:
+        f.write(_nested_page())
+    os.makedirs(os.path.join(site_dir, 'img'))
+    for n, name in enumerate(['hero', 'tracking', 'customs', 'carbon', 'feature_0', 'feature_1', 'feature_2']):
+        _make_image(os.path.join(site_dir, 'img', f"{name}.png"), (1600, 900), (40 * n % 255, 120, 90))
+
+
+def _stages(observations: list, prefix: str) -> dict:
+    """Seconds per stage from captured span observations, summed over repeats of a stage"""
+    totals = {}
+    for name, labels, value in observations:
+        stage = labels.get('stage', '')
+        if name == 'invideo_stage_seconds' and stage.startswith(prefix):
+            totals[stage] = totals.get(stage, 0.0) + value
+    return totals
+
+
+def _median_stages(runs: list) -> dict:
+    stages = {stage for run in runs for stage in run}
+    return {stage: round(statistics.median(run.get(stage, 0.0) for run in runs), 6) for stage in sorted(stages)}
+
+
+def bench_extract(site_dir: str, scraper: WebsiteScraper) -> dict:
+    """Parse time of the single-pass extractor and of each reference extractor"""
+    results = {}
+    for page in PAGES:
+        with open(os.path.join(site_dir, page)) as f:
+            html = f.read()
+        url = f"https://bench.test/{page}"
+
+        single_pass = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            extract(html, url)
+            single_pass.append(time.perf_counter() - start)
+
+        reference = []
+        for _ in range(REPEATS):
+            with metrics.capture() as observations:
+                scraper._extract_with_soup(html, url)
+            reference.append({stage.rsplit('.', 1)[1]: value
+                              for stage, value in _stages(observations, 'scrape.extract.').items()})
+
+        results[page] = {
+            'bytes': len(html.encode()),
+            'lxml_seconds': round(statistics.median(single_pass), 6),
+            'soup_seconds': _median_stages(reference),
+        }
+    return results
+
+
+def bench_scrape(base_url: str, cache_dir: str, browser: bool) -> dict:
+    """End-to-end scrape latency per page, with the time spent in each scrape stage"""
+    modes = {'http': dict(mode='http', capture_screenshots=False)}
+    if browser:
+        modes['browser'] = dict(mode='browser', capture_screenshots=True)
+
+    results = {}
+    with PeakMemory() as memory:
+        for mode, options in modes.items():
+            pool = DriverPool(size=1)
+            scraper = WebsiteScraper(pool=pool, cache=ScrapeCache(os.path.join(cache_dir, mode)), **options)
+            results[mode] = {}
+            for page in PAGES:
+                latencies = []
+                runs = []
+                try:
+                    for _ in range(REPEATS if mode == 'http' else 2):
+                        with metrics.capture() as observations:
+                            start = time.perf_counter()
+                            scraper.scrape(f"{base_url}/{page}", force_refresh=True)
+                            latencies.append(time.perf_counter() - start)
+                        runs.append(_stages(observations, 'scrape.'))
+                except Exception as e:
+                    results[mode][page] = {'error': str(e)}
+                    continue
+                results[mode][page] = {
+                    'seconds': round(statistics.median(latencies), 6),
+                    'stages': _median_stages(runs),
+                }
+            pool.close()
+    results['peak_memory_mb'] = memory.peak_mb
+    return results
+
+
+def bench_render(base_url: str, work_dir: str, profile: str) -> dict:
+    """Render the static page's video segment by segment: build and encode time, encode fps"""
+    scraper = WebsiteScraper(pool=DriverPool(size=1), cache=ScrapeCache(os.path.join(work_dir, 'scrape')),
+                             mode='http', capture_screenshots=False)
+    content = scraper.scrape(f"{base_url}/static.html", force_refresh=True)
+    screenshot = os.path.join(work_dir, 'full_page.png')
+    _make_image(screenshot, (1920, 4000), (230, 236, 240))
+    content['screenshots'] = {'full': screenshot}
+
+    generator = VideoGenerator(profile=profile, render_workers=1,
+                               segment_cache=SegmentCache(os.path.join(work_dir, 'segments')))
+    generator.output_dir = work_dir
+
+    with PeakMemory() as memory:
+        start = time.perf_counter()
+        fetcher = AssetFetcher(cache=ThumbnailCache(os.path.join(work_dir, 'assets')))
+        content['assets'] = fetcher.fetch(generator.image_urls(content), generator.feature_image_size)
+        assets_seconds = time.perf_counter() - start
+
+        segments = []
+        for index, segment in enumerate(generator._plan_segments(content)):
+            path = os.path.join(work_dir, f"{index:02d}_{segment.name}.mp4")
+            with metrics.capture() as observations:
+                start = time.perf_counter()
+                generator._encode_segment(segment, path)
+                elapsed = time.perf_counter() - start
+            stages = _stages(observations, 'render.')
+            frames = round(segment.duration * generator.fps)
+            segments.append({
+                'name': segment.name,
+                'still': generator._is_still(segment),
+                'frames': frames,
+                'seconds': round(elapsed, 6),
+                'build_seconds': round(sum(value for stage, value in stages.items()
+                                           if stage.startswith('render.create_')), 6),
+                'encode_seconds': round(stages.get('render.encode', 0.0), 6),
+                'encode_fps': round(frames / elapsed, 1) if elapsed else None,
+            })
+
+    return {
+        'profile': generator.profile.name,
+        'size': [generator.width, generator.height],
+        'fps': generator.fps,
+        'assets_seconds': round(assets_seconds, 6),
+        'assets': fetcher.stats(),
+        'segments': segments,
+        'total_seconds': round(sum(segment['seconds'] for segment in segments), 6),
+        'peak_memory_mb': memory.peak_mb,
+    }
+
+
+def _environment() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _numbers(results, path: str = '') -> dict:
+    """Numeric leaves of a results tree, keyed by their dotted path"""
+    if isinstance(results, dict):
+        found = {}
+        for key, value in results.items():
+            found.update(_numbers(value, f"{path}.{key}" if path else str(key)))
+        return found
+    if isinstance(results, list):
+        found = {}
+        for index, value in enumerate(results):
+            name = f"{index}:{value['name']}" if isinstance(value, dict) and 'name' in value else index
+            found.update(_numbers(value, f"{path}[{name}]"))
+        return found
+    if isinstance(results, (int, float)) and not isinstance(results, bool):
+        return {path: results}
+    return {}
+
+
+def compare(old: dict, new: dict) -> list:
+    """Lines describing timings, memory and fps that moved by more than COMPARE_THRESHOLD"""
+    old_numbers = _numbers(old['results'])
+    lines = []
+    for path, value in _numbers(new['results']).items():
+        before = old_numbers.get(path)
+        if not before or not path.endswith(('seconds', 'memory_mb', 'fps')):
+            continue
+        change = (value - before) / before
+        if abs(change) < COMPARE_THRESHOLD:
+            continue
+        # Higher fps is better; for everything else lower is better
+        worse = change < 0 if path.endswith('fps') else change > 0
+        lines.append(f"{'REGRESSION' if worse else 'improved':>10}  {path}: {before} -> {value} ({change:+.0%})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    parser.add_argument('--browser', action='store_true')
+    parser.add_argument('--profile', default='preview')
+    args = parser.parse_args()
+
+    environment = _environment()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = os.path.join(tmp_dir, 'site')
+        os.makedirs(site_dir)
+        _build_site(site_dir)
+        server = _serve(site_dir)
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            scraper = WebsiteScraper(pool=DriverPool(size=1), cache=ScrapeCache(os.path.join(tmp_dir, 'cache')))
+            print("Timing extractors...")
+            extract_results = bench_extract(site_dir, scraper)
+            print("Timing scrapes...")
+            scrape_results = bench_scrape(base_url, os.path.join(tmp_dir, 'scrape'), args.browser)
+            print("Timing render...")
+            render_dir = os.path.join(tmp_dir, 'render')
+            os.makedirs(render_dir)
+            render_results = bench_render(base_url, render_dir, args.profile)
+        finally:
+            server.shutdown()
+
+    report = {
+        'environment': environment,
+        'results': {'extract': extract_results, 'scrape': scrape_results, 'render': render_results},
+    }
+
+    for page, result in extract_results.items():
+        print(f"{page:>12}: lxml {result['lxml_seconds'] * 1000:8.2f} ms, "
+              f"soup {sum(result['soup_seconds'].values()) * 1000:8.2f} ms ({result['bytes']} bytes)")
+    for segment in render_results['segments']:
+        print(f"{segment['name']:>12}: {segment['seconds']:6.3f}s, {segment['encode_fps']:7.1f} fps")
+    print(f"Render peak memory: {render_results['peak_memory_mb']} MB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{(environment['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {baseline['environment'].get('commit')}:")
+        print('\n'.join(compare(baseline, report)) or "No changes above the noise threshold")
+
+
+if __name__ == "__main__":
+    main()
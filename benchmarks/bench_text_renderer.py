@@ -0,0 +1,55 @@
+# benchmarks/bench_text_renderer.py
+"""Time Pillow text rendering against MoviePy's ImageMagick TextClip.
+
+Run from the repository root: python -m benchmarks.bench_text_renderer
+The ImageMagick half is skipped when the binary is not configured.
+"""
+
+from app.services.text_renderer import TextRenderer, resolve_font_path
+from app.core.config import settings
+import time
+
+CAPTIONS = [
+    ("Acme Analytics - Insight for every team", 70, 1720),
+    ("Dashboards, alerts and reports that your whole company can use, "
+     "from the first event to the board meeting.", 40, 1520),
+    ("Visit our website to learn more", 60, None),
+]
+ROUNDS = 20
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text, fontsize, width in CAPTIONS:
+            fn(text, fontsize, width)
+    return (time.perf_counter() - start) / (ROUNDS * len(CAPTIONS))
+
+
+def main():
+    font = resolve_font_path(settings.text_font)
+
+    uncached = TextRenderer(cache_size=0)
+    cold = _time(lambda text, size, width: uncached.render(text, font, size, width=width))
+    cached = TextRenderer()
+    warm = _time(lambda text, size, width: cached.render(text, font, size, width=width))
+    print(f"Pillow, uncached:     {cold * 1000:8.2f} ms/caption")
+    print(f"Pillow, cached:       {warm * 1000:8.2f} ms/caption")
+
+    try:
+        from moviepy.editor import TextClip
+
+        def imagemagick(text, size, width):
+            TextClip(txt=text, fontsize=size, font=font, color='white',
+                     size=(width, None) if width else None, method='caption')
+
+        magick = _time(imagemagick)
+    except Exception as e:
+        print(f"ImageMagick:          skipped ({str(e).splitlines()[0]})")
+        return
+    print(f"ImageMagick TextClip: {magick * 1000:8.2f} ms/caption")
+    print(f"Speedup (uncached):   {magick / cold:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
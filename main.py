@@ -1,7 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from app.services.scraper import WebsiteScraper
+from typing import List, Optional
+from app.services.driver_pool import get_driver_pool
+from app.services.scrape_cache import get_scrape_cache
+from app.services.job_queue import QueueFullError, get_job_queue, shutdown_job_queue
+from app.services.scheduler import domain_of
+from app.services.payload import check_fields, shape_payload
+from app.services.progress import get_progress_hub
+from app.services.status_writer import get_status_writer
+from app.services.job_events import apply_job_event, publish_progress
+from app.api.endpoints import video
+from app.api.json_response import FastJSONResponse
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import fail_interrupted_jobs, init_db
 
 app = FastAPI()
 
@@ -14,14 +27,99 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(video.router)
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profile handlers for requests sent with an X-Profile header, when ALLOW_PROFILING is set"""
+    if not (settings.allow_profiling and request.headers.get("x-profile")):
+        return await call_next(request)
+    holder = {}
+    token = metrics.profile_request.set(holder)
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.profile_request.reset(token)
+    if 'path' in holder:
+        response.headers["X-Profile-File"] = holder['path']
+    return response
+
 class WebsiteRequest(BaseModel):
     url: str
+    force_refresh: bool = False
+    # Response shape: top-level fields to include (default all) and a page of sections.
+    # Compact drops repeated section text and cuts long texts to max_text_length.
+    fields: Optional[List[str]] = None
+    compact: bool = False
+    max_text_length: Optional[int] = None
+    section_offset: int = 0
+    section_limit: Optional[int] = None
 
 @app.post("/api/scrape")
-async def scrape_website(request: WebsiteRequest):
+@metrics.profiled
+def scrape_website(request: WebsiteRequest):
+    # Imported on first use so Selenium and BeautifulSoup stay out of API startup
+    from app.services.scraper import WebsiteScraper
+    try:
+        check_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if request.section_offset < 0 or any(value is not None and value < 1
+                                         for value in (request.section_limit, request.max_text_length)):
+        raise HTTPException(status_code=422,
+                            detail="section_offset must be 0 or more, section_limit and max_text_length 1 or more")
     scraper = WebsiteScraper()
-    content = scraper.scrape(request.url)
-    return content
+    # Same per-domain limits as video jobs, at interactive priority
+    try:
+        with get_job_queue().scrape_slot(domain_of(request.url)):
+            content = scraper.scrape(request.url, force_refresh=request.force_refresh)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    payload = shape_payload(content, fields=request.fields, compact=request.compact,
+                            max_text=request.max_text_length, section_offset=request.section_offset,
+                            section_limit=request.section_limit)
+    return FastJSONResponse(payload)
+
+@app.get("/api/scrape/cache")
+def scrape_cache_stats():
+    return get_scrape_cache().stats()
+
+@app.get("/api/driver-pool")
+def driver_pool_stats():
+    return get_driver_pool().stats()
+
+@app.get("/api/jobs")
+def job_queue_stats():
+    return get_job_queue().stats()
+
+@app.get("/api/progress")
+def progress_hub_stats():
+    return get_progress_hub().stats()
+
+@app.get("/api/status-writer")
+def status_writer_stats():
+    return get_status_writer().stats()
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Stage timings and counters in the Prometheus text format"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def start_services():
+    await init_db()
+    interrupted = await fail_interrupted_jobs()
+    if interrupted:
+        print(f"Marked {interrupted} interrupted video jobs as failed")
+    get_status_writer().start()
+    get_job_queue(on_event=apply_job_event, on_progress=publish_progress)
+
+@app.on_event("shutdown")
+async def stop_services():
+    shutdown_job_queue()
+    # After the queue, so the last job events are written too
+    await get_status_writer().stop()
+    get_driver_pool().close()
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,102 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+from app.services.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.visited = []
+        self.quit_called = False
+        self.dead = False
+        self.gone = False
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        self.window_handles.pop()
+
+    def execute_script(self, script):
+        if self.dead:
+            raise WebDriverException("chrome not reachable")
+        if self.gone:
+            # What Selenium raises once chromedriver itself has exited
+            raise MaxRetryError(None, "/session/1/execute/sync", ConnectionRefusedError(111, "Connection refused"))
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakePool(DriverPool):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.launched = []
+
+    def _launch(self):
+        driver = FakeDriver()
+        self.launched.append(driver)
+        return driver
+
+
+def test_drivers_are_reset_on_reuse_and_recycled_after_max_uses():
+    pool = FakePool(size=1, max_uses=2)
+    with pool.driver() as driver:
+        driver.window_handles.append("popup")
+    # Extra tabs are closed and the page blanked before the next job
+    assert driver.window_handles == ["main"] and driver.visited == ["about:blank"]
+    with pool.driver() as second:
+        assert second is driver
+    assert driver.quit_called
+    with pool.driver() as third:
+        assert third is not driver
+    stats = pool.stats()
+    assert (stats['launched'], stats['recycled'], stats['crashed']) == (2, 1, 0)
+
+
+def test_dead_drivers_are_discarded():
+    pool = FakePool(size=1, max_uses=10)
+    with pytest.raises(WebDriverException):
+        with pool.driver():
+            raise WebDriverException("tab crashed")
+    # A driver that fails its reset is retired too
+    with pool.driver() as driver:
+        driver.dead = True
+    with pool.driver() as fresh:
+        assert fresh is not driver
+    assert len(pool.launched) == 3 and pool.stats()['crashed'] == 2
+
+
+def test_closed_pool_retires_returned_drivers():
+    pool = FakePool(size=1)
+    entry = pool.acquire()
+    pool.close()
+    pool.release(entry)
+    assert entry.driver.quit_called and pool.stats()['live'] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_lost_chromedriver_frees_its_slot():
+    pool = FakePool(size=1, max_uses=10, acquire_timeout=0.1)
+    with pool.driver() as driver:
+        driver.gone = True
+    with pytest.raises(ConnectionRefusedError):
+        with pool.driver() as second:
+            assert second is not driver
+            raise ConnectionRefusedError(111, "Connection refused")
+    stats = pool.stats()
+    assert (stats['in_use'], stats['live'], stats['crashed']) == (0, 0, 2)
+    # The pool is not wedged: the next borrower gets a fresh browser
+    with pool.driver() as fresh:
+        assert fresh is not second
+    assert len(pool.launched) == 3
@@ -0,0 +1,62 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.file_response import RangeFileResponse
+
+DATA = bytes(range(256)) * 4096
+
+
+def _client(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(DATA)
+    app = FastAPI()
+
+    @app.api_route("/file", methods=["GET", "HEAD"])
+    def serve():
+        return RangeFileResponse(str(path), media_type="video/mp4")
+
+    return TestClient(app)
+
+
+def test_ranges_and_conditional_requests(tmp_path):
+    client = _client(tmp_path)
+    full = client.get("/file")
+    assert full.status_code == 200 and full.content == DATA
+    assert full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+
+    part = client.get("/file", headers={"Range": "bytes=100-299"})
+    assert part.status_code == 206 and part.content == DATA[100:300]
+    assert part.headers["content-range"] == f"bytes 100-299/{len(DATA)}"
+
+    assert client.get("/file", headers={"Range": "bytes=-10"}).content == DATA[-10:]
+    assert client.get("/file", headers={"Range": "bytes=1048570-"}).content == DATA[1048570:]
+    assert client.get("/file", headers={"Range": f"bytes={len(DATA)}-"}).status_code == 416
+    # A stale If-Range gets the whole file instead of a piece of a different one
+    assert client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"old"'}).status_code == 200
+
+    cached = client.get("/file", headers={"If-None-Match": f'"other", {etag}'})
+    assert cached.status_code == 304 and cached.content == b""
+    head = client.head("/file")
+    assert head.headers["content-length"] == str(len(DATA)) and head.content == b""
+
+
+def test_zero_copy_send_when_the_server_offers_it(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(DATA)
+    scope = {
+        "type": "http", "method": "GET", "extensions": {"http.response.zerocopysend": {}},
+        "headers": [(b"range", b"bytes=10-19")],
+    }
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = dict(message, file=message["file"].name)
+        messages.append(message)
+
+    asyncio.run(RangeFileResponse(str(path), media_type="video/mp4")(scope, None, send))
+    assert messages[0]["status"] == 206
+    assert messages[1] == {"type": "http.response.zerocopysend", "file": str(path), "offset": 10, "count": 10}
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.job_queue import LocalBackend, QueueFullError, emit
+from app.services.scheduler import DomainScheduler
+
+
+def stub_job(job_id, seconds):
+    emit(job_id, "scraping")
+    time.sleep(seconds)
+    return {'output_path': f"output/{job_id}.mp4"}
+
+
+def test_jobs_run_queue_up_and_cancel(monkeypatch):
+    monkeypatch.setattr(settings, "worker_prewarm", False)
+    events = []
+    done = threading.Event()
+
+    def on_event(job_id, status, fields):
+        events.append((job_id, status, fields))
+        if status == "completed":
+            done.set()
+
+    scheduler = DomainScheduler(concurrency=5, rate=0, burst=1, overrides={}, browser_slots=10, min_free_memory_mb=0)
+    queue = LocalBackend(on_event, max_workers=1, max_pending=2, scheduler=scheduler)
+    queue.start()
+    try:
+        queue.submit(1, stub_job, 0.5, domain="a.test")
+        # Waits for the single worker
+        queue.submit(2, stub_job, 0, domain="b.test")
+        assert queue.is_full()
+        with pytest.raises(QueueFullError):
+            queue.submit(3, stub_job, 0, domain="c.test")
+        assert queue.cancel(2)
+        assert not queue.cancel(99)
+        assert done.wait(60)
+    finally:
+        queue.shutdown()
+
+    assert (2, "cancelled", {}) in events
+    assert (1, "scraping", {}) in events
+    assert (1, "completed", {'output_path': "output/1.mp4"}) in events
+    assert not any(job_id == 2 and status != "cancelled" for job_id, status, _ in events)
+
+
+def test_waiting_scrape_times_out_without_filling_the_queue():
+    # Not started, so nothing hands out the slot
+    scheduler = DomainScheduler(concurrency=5, rate=0, burst=1, overrides={}, browser_slots=10, min_free_memory_mb=0)
+    queue = LocalBackend(lambda *args: None, max_workers=1, max_pending=1, scheduler=scheduler)
+    errors = []
+
+    def scrape():
+        try:
+            with queue.scrape_slot("a.test", timeout=0.5):
+                pass
+        except QueueFullError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=scrape)
+    thread.start()
+    time.sleep(0.1)
+    assert queue.stats()['waiting_scrapes'] == 1
+    assert not queue.is_full()
+    thread.join(5)
+    assert len(errors) == 1
+    assert queue.stats()['waiting_scrapes'] == 0
+    assert scheduler.pending('interactive') == 0
+
+
+def test_scrape_endpoint_returns_429_without_a_slot(monkeypatch):
+    from contextlib import contextmanager
+
+    from fastapi.testclient import TestClient
+
+    import main
+
+    class BusyQueue:
+        @contextmanager
+        def scrape_slot(self, domain, timeout=None):
+            raise QueueFullError(f"No scrape slot for {domain} within 30s")
+            yield
+
+    monkeypatch.setattr(main, "get_job_queue", lambda: BusyQueue())
+    response = TestClient(main.app).post("/api/scrape", json={'url': "https://a.test/"})
+    assert response.status_code == 429
+    assert "a.test" in response.json()['detail']
+
+
+def test_scrape_slot_is_not_held_up_by_a_job_waiting_for_a_worker(monkeypatch):
+    monkeypatch.setattr(settings, "worker_prewarm", False)
+    scheduler = DomainScheduler(concurrency=2, rate=0, burst=1, overrides={}, browser_slots=10, min_free_memory_mb=0)
+    queue = LocalBackend(lambda *args: None, max_workers=1, max_pending=4, scheduler=scheduler)
+    queue.start()
+    try:
+        queue.submit(1, stub_job, 1, domain="other.test")
+        # Queued behind the busy worker, at the head of example.test's queue
+        queue.submit(2, stub_job, 0, domain="example.test")
+        with queue.scrape_slot("example.test", timeout=0.5):
+            assert scheduler.stats()['domains']['example.test']['active'] == 1
+        deadline = time.monotonic() + 30
+        while (queue.stats()['running'] or queue.stats()['queued']) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        queue.shutdown()
@@ -0,0 +1,22 @@
+from app.core import metrics
+
+
+def test_span_is_rendered_as_histogram():
+    before = metrics.render()
+    with metrics.span('test.stage'):
+        pass
+
+    text = metrics.render()
+    assert 'test.stage' not in before
+    assert 'invideo_stage_seconds_count{stage="test.stage"} 1' in text
+    assert 'invideo_stage_seconds_bucket{stage="test.stage",le="+Inf"} 1' in text
+    assert '# TYPE invideo_stage_seconds histogram' in text
+
+
+def test_captured_observations_are_recorded_on_replay():
+    with metrics.capture() as observations:
+        metrics.SEGMENTS_TOTAL.inc(cache='test')
+    assert 'cache="test"' not in metrics.render()
+
+    metrics.replay(observations)
+    assert 'invideo_segments_total{cache="test"} 1' in metrics.render()
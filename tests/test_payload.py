@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from app.api.json_response import FastJSONResponse
+from app.services.payload import shape_payload
+
+DATA = {
+    'title': 'Acme',
+    'description': 'Tools',
+    'main_content': 'x' * 40,
+    'images': ['https://acme.test/a.png'],
+    'sections': [
+        {'text': 'Fast  builds', 'type': 'div', 'class': [], 'id': 'a'},
+        {'text': 'Fast builds', 'type': 'section', 'class': [], 'id': 'b'},
+        {'text': 'Cheap ' * 10, 'type': 'div', 'class': ['c'], 'id': ''},
+        {'text': 'Friendly support', 'type': 'div', 'class': [], 'id': ''},
+    ],
+    'features': [{'title': 'Speed', 'description': 'y' * 40, 'image': None}],
+    'colors': ['#fff'],
+}
+
+
+def test_compact_dedupes_truncates_and_paginates():
+    payload = shape_payload(DATA, compact=True, max_text=20, section_offset=1, section_limit=1)
+    assert payload['sections_total'] == 3
+    assert [section['text'] for section in payload['sections']] == ['Cheap Cheap Cheap Ch…']
+    assert payload['main_content'] == 'x' * 20 + '…'
+    assert payload['features'][0]['description'] == 'y' * 20 + '…'
+    # The full payload is left alone
+    assert shape_payload(DATA)['sections'] == DATA['sections']
+
+
+def test_field_selection_and_serialization():
+    payload = shape_payload(DATA, fields=['title', 'sections'], section_limit=2)
+    assert set(payload) == {'title', 'sections', 'sections_total'}
+    assert len(payload['sections']) == 2 and payload['sections_total'] == 4
+    assert json.loads(FastJSONResponse(payload).body) == payload
+    with pytest.raises(ValueError):
+        shape_payload(DATA, fields=['title', 'html'])
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+from app.services.progress import ProgressHub
+
+
+def test_events_published_from_other_threads_reach_every_watcher():
+    hub = ProgressHub()
+
+    async def watch():
+        watchers = [hub.subscribe(7), hub.subscribe(7)]
+        publisher = threading.Thread(target=lambda: [
+            hub.publish(7, {'status': 'rendering'}),
+            hub.publish(7, {'frames': 24, 'total_frames': 96, 'eta_seconds': 3.0}),
+        ])
+        publisher.start()
+        received = [[await watcher.get(), await watcher.get()] for watcher in watchers]
+        publisher.join()
+        for watcher in watchers:
+            hub.unsubscribe(watcher)
+        return received
+
+    received = asyncio.run(watch())
+    assert received[0] == received[1] == [
+        {'status': 'rendering'},
+        {'frames': 24, 'total_frames': 96, 'eta_seconds': 3.0},
+    ]
+    assert hub.snapshot(7) == {'id': 7, 'status': 'rendering', 'frames': 24, 'total_frames': 96, 'eta_seconds': 3.0}
+    assert hub.stats()['watchers'] == 0
+
+
+def test_seed_does_not_overwrite_newer_state():
+    hub = ProgressHub(max_snapshots=2)
+    hub.publish(1, {'status': 'completed'})
+    assert hub.seed(1, {'id': 1, 'status': 'queued'})['status'] == 'completed'
+
+    hub.seed(2, {'id': 2, 'status': 'queued'})
+    hub.seed(3, {'id': 3, 'status': 'queued'})
+    assert hub.snapshot(1) is None
+
+
+def test_progress_after_eviction_leaves_no_partial_snapshot():
+    hub = ProgressHub(max_snapshots=2)
+    hub.publish(1, {'status': 'rendering'})
+    hub.publish(2, {'status': 'queued'})
+    hub.publish(3, {'status': 'queued'})
+    assert hub.snapshot(1) is None
+
+    hub.publish(1, {'frames': 24, 'total_frames': 96})
+    # Watchers fall back to the database rather than a state with no status
+    assert hub.snapshot(1) is None
+    assert hub.seed(1, {'id': 1, 'status': 'rendering'}) == {'id': 1, 'status': 'rendering'}
+    hub.publish(1, {'frames': 48, 'total_frames': 96})
+    assert hub.snapshot(1) == {'id': 1, 'status': 'rendering', 'frames': 48, 'total_frames': 96}
@@ -0,0 +1,56 @@
+import functools
+import shutil
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.driver_pool import DriverPool
+from app.services.readiness import DocumentReady, DomQuiet, NetworkIdle, PageReadiness, install_page_hooks
+
+# A ticker: text changes every 50 ms and a class flips every frame, forever
+BUSY_PAGE = """<!doctype html><html><body><h1 id="ticker">0</h1><div id="slide"></div><script>
+var n = 0;
+setInterval(function () { document.getElementById('ticker').textContent = String(++n); }, 50);
+(function spin() { document.getElementById('slide').classList.toggle('on'); requestAnimationFrame(spin); })();
+</script></body></html>"""
+
+
+class BusyPageDriver:
+    """Stands in for a browser on a page that mutates constantly with nothing in flight"""
+
+    def execute_script(self, script, *args):
+        # Never quiet: only the max-wait escape (arguments[0]) can pass
+        return bool(args and args[0])
+
+
+def test_dom_quiet_stops_waiting_on_pages_that_never_settle():
+    readiness = PageReadiness([DomQuiet(max_wait=0.3, timeout=5)], budget=10, poll_interval=0.05)
+    result = readiness.wait(BusyPageDriver())
+    assert result['timed_out'] == []
+    assert 0.3 <= result['wait_time'] < 1
+
+
+@pytest.mark.skipif(not any(shutil.which(name) for name in ("google-chrome", "chromium", "chromium-browser")),
+                    reason="needs a local Chrome install")
+def test_constantly_mutating_page_is_ready_before_the_timeout(tmp_path):
+    (tmp_path / "busy.html").write_text(BUSY_PAGE)
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pool = DriverPool(size=1)
+    try:
+        with pool.driver() as driver:
+            install_page_hooks(driver)
+            driver.get(f"http://127.0.0.1:{server.server_port}/busy.html")
+            checks = [DocumentReady(), NetworkIdle(), DomQuiet(max_wait=1, timeout=8)]
+            result = PageReadiness(checks, budget=15).wait(driver)
+    finally:
+        pool.close()
+        server.shutdown()
+    assert result['timed_out'] == []
+    assert result['wait_time'] < 4
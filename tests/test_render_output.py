@@ -0,0 +1,58 @@
+import os
+
+import imageio_ffmpeg
+import numpy as np
+import pytest
+
+from app.services.encoder import FrameSink
+from app.services.segment_cache import SegmentCache
+from app.services.video_generator import VideoGenerator
+
+CONTENT = {'title': 'Acme', 'description': 'Tools', 'screenshots': {}, 'features': []}
+# Intro, three feature cards and the outro: 5 + 3 * 4 + 5 seconds
+FEATURE_CONTENT = dict(CONTENT, features=[{'title': name, 'description': f"{name} builds", 'image': None}
+                                          for name in ('Fast', 'Cheap', 'Friendly')])
+
+
+def test_aborted_sink_leaves_no_file(tmp_path):
+    path = str(tmp_path / "partial.mp4")
+    with pytest.raises(RuntimeError):
+        with FrameSink((64, 64), path, fps=4) as sink:
+            for _ in range(8):
+                sink.write(np.zeros((64, 64, 3), dtype=np.uint8))
+            raise RuntimeError("render failed")
+    assert not os.path.exists(path)
+
+
+def test_failed_render_is_not_left_at_the_output_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator = VideoGenerator(profile='preview', render_workers=1, segment_cache=SegmentCache(str(tmp_path / "seg")))
+    generator.output_dir = str(tmp_path / "out")
+    os.makedirs(generator.output_dir)
+
+    def fail_midway(segments, keys, output_path):
+        with open(output_path, 'wb') as f:
+            f.write(b'truncated')
+        raise RuntimeError("encoder crashed")
+
+    monkeypatch.setattr(generator, '_render_segments', fail_midway)
+    with pytest.raises(Exception):
+        generator.generate(CONTENT)
+    assert os.listdir(generator.output_dir) == []
+
+
+@pytest.mark.parametrize('render_mode, workers', [('parallel', 2), ('parallel', 1), ('single', 1)])
+def test_segments_join_into_one_continuous_video(tmp_path, monkeypatch, render_mode, workers):
+    monkeypatch.chdir(tmp_path)
+    cache = SegmentCache(str(tmp_path / "seg"))
+    generator = VideoGenerator(profile='preview', render_mode=render_mode, render_workers=workers, segment_cache=cache)
+    generator.output_dir = str(tmp_path / "out")
+    os.makedirs(generator.output_dir)
+
+    path = generator.generate(FEATURE_CONTENT)
+    frames, seconds = imageio_ffmpeg.count_frames_and_secs(path)
+    # Every segment's frames are in the joined file, at the profile's frame rate
+    assert frames == 22 * generator.fps
+    assert seconds == pytest.approx(22, abs=0.1)
+    if render_mode == 'parallel':
+        assert len([name for name in os.listdir(cache.cache_dir) if name.endswith('.mp4')]) == 5
@@ -0,0 +1,77 @@
+from app.services.scheduler import DomainScheduler, domain_of
+
+
+def _scheduler(**kwargs):
+    options = dict(concurrency=1, rate=0, burst=1, overrides={}, browser_slots=10, min_free_memory_mb=0)
+    options.update(kwargs)
+    return DomainScheduler(**options)
+
+
+def _drain(scheduler):
+    started = []
+    while True:
+        picked = scheduler.pop()
+        if picked is None:
+            return started
+        started.append(picked[0])
+
+
+def test_domain_of_ignores_case_and_www():
+    assert domain_of("https://WWW.Acme.test/pricing") == "acme.test"
+    assert domain_of("http://shop.acme.test:8080/") == "shop.acme.test"
+
+
+def test_round_robin_across_domains_within_concurrency():
+    scheduler = _scheduler(concurrency=2)
+    for n in range(4):
+        scheduler.push(f"a{n}", "a.test", "bulk")
+    scheduler.push("b0", "b.test", "bulk")
+
+    assert _drain(scheduler) == ["a0", "b0", "a1"]
+
+    scheduler.release("a.test")
+    assert _drain(scheduler) == ["a2"]
+    assert scheduler.stats()['domains']['a.test']['queued'] == {'interactive': 0, 'bulk': 1}
+
+
+def test_interactive_work_goes_first():
+    scheduler = _scheduler(concurrency=5)
+    scheduler.push("bulk", "a.test", "bulk")
+    scheduler.push("preview", "b.test", "interactive")
+
+    assert _drain(scheduler) == ["preview", "bulk"]
+
+
+def test_rate_limit_and_browser_slots():
+    scheduler = _scheduler(concurrency=5, rate=2, burst=1, overrides={"fast.test": {"rate": 0}}, browser_slots=3)
+    for n in range(3):
+        scheduler.push(f"slow{n}", "slow.test", "bulk")
+        scheduler.push(f"fast{n}", "fast.test", "bulk")
+
+    # One start from the bucket, then the slow domain must wait; three slots in total
+    assert _drain(scheduler) == ["slow0", "fast0", "fast1"]
+    scheduler.release("fast.test")
+    assert _drain(scheduler) == ["fast2"]
+    assert 0 < scheduler.retry_in() <= 0.5
+
+
+def test_remove_queued_item():
+    scheduler = _scheduler()
+    scheduler.push(1, "a.test", "bulk")
+    scheduler.push(2, "a.test", "bulk")
+
+    assert scheduler.remove(2)
+    assert not scheduler.remove(3)
+    assert _drain(scheduler) == [1]
+    assert scheduler.pending() == 0
+
+
+def test_vetoed_item_does_not_block_its_domain():
+    scheduler = _scheduler(concurrency=2)
+    scheduler.push("job", "a.test", "interactive")
+    scheduler.push("scrape", "a.test", "interactive")
+
+    # No idle worker for the job, but the scrape behind it may start
+    assert scheduler.pop(accept=lambda item: item != "job") == ("scrape", "a.test")
+    assert scheduler.pop(accept=lambda item: item != "job") is None
+    assert _drain(scheduler) == ["job"]
@@ -0,0 +1,89 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import scrape_cache
+from app.services.scrape_cache import ScrapeCache
+
+VIEWPORT = (1920, 1080)
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class ValidatorHandler(BaseHTTPRequestHandler):
+    """Answers HEAD with the current validators, and 304 when the client's still match"""
+    etag = '"v1"'
+    last_modified = LAST_MODIFIED
+
+    def do_HEAD(self):
+        unchanged = (
+            (self.etag and self.headers.get('If-None-Match') == self.etag)
+            or (not self.etag and self.headers.get('If-Modified-Since') == self.last_modified)
+        )
+        self.send_response(304 if unchanged else 200)
+        if self.etag:
+            self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', self.last_modified)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def page_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ValidatorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    ValidatorHandler.etag = '"v1"'
+
+
+def _later(monkeypatch, seconds):
+    now = scrape_cache.time.time()
+    monkeypatch.setattr(scrape_cache.time, "time", lambda: now + seconds)
+
+
+def test_entries_expire_after_ttl_without_validators(tmp_path, monkeypatch):
+    cache = ScrapeCache(str(tmp_path), ttl=60)
+    cache.store("https://acme.test/", VIEWPORT, {'title': 'Acme'}, validators={})
+    assert cache.lookup("https://acme.test/?utm_source=x", VIEWPORT) == {'title': 'Acme', 'screenshots': {}}
+    _later(monkeypatch, 120)
+    assert cache.lookup("https://acme.test/", VIEWPORT) is None
+
+
+def test_stale_entries_are_revalidated_by_etag(tmp_path, page_url):
+    cache = ScrapeCache(str(tmp_path), ttl=0)
+    before = cache.stats()
+    cache.store(page_url, VIEWPORT, {'title': 'Acme'})
+    assert cache.lookup(page_url, VIEWPORT)['title'] == 'Acme'
+    ValidatorHandler.etag = '"v2"'
+    assert cache.lookup(page_url, VIEWPORT) is None
+    after = cache.stats()
+    assert after['revalidated'] - before['revalidated'] == 1
+    assert after['misses'] - before['misses'] == 1
+
+
+def test_stale_entries_are_revalidated_by_last_modified(tmp_path, page_url):
+    ValidatorHandler.etag = None
+    cache = ScrapeCache(str(tmp_path), ttl=0)
+    cache.store(page_url, VIEWPORT, {'title': 'Acme'})
+    assert cache.lookup(page_url, VIEWPORT)['title'] == 'Acme'
+    ValidatorHandler.last_modified = "Thu, 02 Jan 2025 00:00:00 GMT"
+    try:
+        assert cache.lookup(page_url, VIEWPORT) is None
+    finally:
+        ValidatorHandler.last_modified = LAST_MODIFIED
+
+
+def test_store_swaps_in_a_new_version(tmp_path):
+    cache = ScrapeCache(str(tmp_path), ttl=60)
+    cache.store("https://acme.test/", VIEWPORT, {'title': 'Old', 'screenshots': {'full': b'old'}}, validators={})
+    data = cache.store("https://acme.test/", VIEWPORT, {'title': 'New', 'screenshots': {'full': b'new'}},
+                       validators={})
+    assert cache.lookup("https://acme.test/", VIEWPORT)['title'] == 'New'
+    with open(data['screenshots']['full'], 'rb') as f:
+        assert f.read() == b'new'
+    # One link and the version it points at; the old version is gone
+    assert len(os.listdir(tmp_path)) == 2
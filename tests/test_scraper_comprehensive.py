@@ -0,0 +1,258 @@
+import base64
+import functools
+import glob
+import io
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from app.services.assets import AssetFetcher, ThumbnailCache
+from app.services.driver_pool import DriverPool
+from app.services.extractor import extract, resolve_image_url
+from app.services.http_fetcher import needs_browser
+from app.services.scrape_cache import ScrapeCache
+from app.services.scraper import WebsiteScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+PAGE_URL = "https://acme.test/landing"
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return WebsiteScraper(pool=DriverPool(size=1), cache=ScrapeCache(str(tmp_path / "cache")))
+
+
+def _serve(directory):
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def fixture_server():
+    server = _serve(FIXTURES_DIR)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class NoBrowserPool(DriverPool):
+    def acquire(self):
+        raise AssertionError("the browser should not be used")
+
+
+def _png(size):
+    output = io.BytesIO()
+    Image.new('RGB', size, (200, 200, 200)).save(output, format='PNG')
+    return output.getvalue()
+
+
+class FakeElement:
+    screenshot_as_png = _png((1920, 400))
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for the screenshot code; the page only has a <header>"""
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Page.getLayoutMetrics':
+            return {'cssContentSize': {'width': 1920, 'height': 4321.5},
+                    'cssLayoutViewport': {'clientWidth': 1920, 'clientHeight': 1080}}
+        clip = params['clip']
+        return {'data': base64.b64encode(_png((clip['width'], clip['height']))).decode()}
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_async_script(self, script, *args):
+        return None
+
+    def get_screenshot_as_png(self):
+        return _png((1920, 1080))
+
+    def find_elements(self, by, value):
+        return [FakeElement()] if (by, value) == (By.TAG_NAME, 'header') else []
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _dedupe_sections(sections):
+    seen = set()
+    unique = []
+    for section in sections:
+        if section['text'] not in seen:
+            seen.add(section['text'])
+            unique.append(section)
+    return unique
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_single_pass_matches_reference_extractors(scraper, path):
+    page_source = _read(path)
+    expected = scraper._extract_with_soup(page_source, PAGE_URL)
+    actual = extract(page_source, PAGE_URL)
+
+    for field in ('title', 'description', 'main_content', 'images', 'features'):
+        assert actual[field] == expected[field], field
+    assert set(actual['colors']) == set(expected['colors'])
+    # Nested wrappers with identical text are collapsed into the outermost one
+    assert actual['sections'] == _dedupe_sections(expected['sections'])
+
+
+def test_nested_wrappers_are_reported_once():
+    page_source = _read(os.path.join(FIXTURES_DIR, "landing.html"))
+    texts = [section['text'] for section in extract(page_source, PAGE_URL)['sections']]
+
+    assert len(texts) == len(set(texts))
+    assert any(text.startswith("Insight for every team") for text in texts)
+
+
+def test_skips_script_style_and_template_text():
+    page_source = _read(os.path.join(FIXTURES_DIR, "landing.html"))
+    data = extract(page_source, PAGE_URL)
+    all_text = ' '.join(section['text'] for section in data['sections'])
+
+    assert "tracking" not in all_text
+    assert "Template content" not in all_text
+    assert "comment" not in all_text
+
+
+def test_empty_document():
+    data = extract("", PAGE_URL)
+
+    assert data['title'] == ''
+    assert data['sections'] == []
+
+
+def test_http_mode_extracts_without_browser(tmp_path, monkeypatch, fixture_server):
+    monkeypatch.chdir(tmp_path)
+    scraper = WebsiteScraper(pool=NoBrowserPool(size=1), cache=ScrapeCache(str(tmp_path / "cache")),
+                             mode='http', capture_screenshots=False)
+    url = f"{fixture_server}/landing.html"
+
+    data = scraper.scrape(url)
+
+    expected = extract(_read(os.path.join(FIXTURES_DIR, "landing.html")), url)
+    assert data['fetch_mode'] == 'http'
+    assert data['title'] == expected['title']
+    assert data['sections'] == expected['sections']
+    assert data['screenshots'] == {}
+
+
+def test_auto_mode_escalates_client_rendered_pages(tmp_path, monkeypatch, fixture_server):
+    monkeypatch.chdir(tmp_path)
+    scraper = WebsiteScraper(pool=NoBrowserPool(size=1), cache=ScrapeCache(str(tmp_path / "cache")),
+                             mode='auto', capture_screenshots=False)
+
+    assert scraper._scrape_http(f"{fixture_server}/landing.html")['fetch_mode'] == 'http'
+    assert scraper._scrape_http(f"{fixture_server}/spa.html") is None
+
+
+def test_needs_browser_heuristic():
+    assert needs_browser(_read(os.path.join(FIXTURES_DIR, "spa.html")))
+    assert not needs_browser(_read(os.path.join(FIXTURES_DIR, "landing.html")))
+
+
+def test_screenshots_are_full_height_bytes_with_hero_fallback(scraper, tmp_path):
+    scraper.driver = FakeDriver()
+    screenshots = scraper._take_screenshots()
+
+    assert Image.open(io.BytesIO(screenshots['full'])).size == (1920, 4322)
+    assert Image.open(io.BytesIO(screenshots['above_fold'])).size == (1920, 1080)
+    # The class and id locators find nothing, so the <header> fallback is used
+    assert screenshots['hero'] == FakeElement.screenshot_as_png
+
+    stored = scraper.cache.store(PAGE_URL, scraper.viewport, {'screenshots': screenshots}, validators={})
+    with open(stored['screenshots']['full'], 'rb') as f:
+        assert f.read() == screenshots['full']
+
+
+class NoBodyDriver(FakeDriver):
+    """A document without a <body>, where CDP capture is unavailable"""
+
+    def execute_cdp_cmd(self, cmd, params):
+        raise WebDriverException("CDP unavailable")
+
+    def execute_script(self, script, *args):
+        if "scrollHeight" in script:
+            return [0, 1080]
+        return 0
+
+
+def test_stitching_a_page_without_body_falls_back_to_the_viewport(scraper):
+    scraper.driver = NoBodyDriver()
+    assert Image.open(io.BytesIO(scraper._capture_full_page())).size == (1920, 1080)
+
+
+def test_image_urls_resolve_against_the_page():
+    page_url = "http://acme.test/docs/guide/"
+
+    assert resolve_image_url("img/a.png", page_url) == "http://acme.test/docs/guide/img/a.png"
+    assert resolve_image_url("../b.png", page_url) == "http://acme.test/docs/b.png"
+    assert resolve_image_url("/c.png", page_url) == "http://acme.test/c.png"
+    assert resolve_image_url("//cdn.acme.test/d.png", page_url) == "http://cdn.acme.test/d.png"
+
+
+def test_assets_are_downscaled_once_and_cached(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "logo.png").write_bytes(_png((1600, 800)))
+    (site / "logo-copy.png").write_bytes((site / "logo.png").read_bytes())
+    (site / "huge.png").write_bytes(_png((4000, 4000)))
+    server = _serve(str(site))
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}/logo.png", f"{base}/logo.png", f"{base}/logo-copy.png",
+            f"{base}/huge.png", f"{base}/missing.png", "data:image/png;base64,AAAA"]
+    try:
+        cache = ThumbnailCache(str(tmp_path / "assets"))
+        fetcher = AssetFetcher(cache=cache, max_bytes=(site / "logo.png").stat().st_size)
+        assets = fetcher.fetch(urls, (400, 300))
+
+        assert set(assets) == {f"{base}/logo.png", f"{base}/logo-copy.png"}
+        # Identical bytes behind two URLs share one thumbnail
+        assert assets[f"{base}/logo.png"] == assets[f"{base}/logo-copy.png"]
+        assert Image.open(assets[f"{base}/logo.png"]).size == (400, 200)
+        assert fetcher.stats()['fetched'] == 2
+        assert fetcher.stats()['failed'] == 2
+
+        # A repeat run is served from the cache without touching the network
+        server.shutdown()
+        assert AssetFetcher(cache=cache).fetch(urls[:3], (400, 300)) == assets
+    finally:
+        server.shutdown()
+
+
+def test_thumbnail_cache_evicts_least_recently_used(tmp_path):
+    def image(color):
+        output = io.BytesIO()
+        Image.effect_noise((200, 200), 64 + color).convert('RGB').save(output, format='PNG')
+        return output.getvalue()
+
+    cache = ThumbnailCache(str(tmp_path / "assets"), max_bytes=10 ** 9)
+    first = cache.put("https://acme.test/a.png", image(0), (100, 100))
+    # Room for two thumbnails, not three
+    cache.max_bytes = int(2.5 * os.path.getsize(first))
+    second = cache.put("https://acme.test/b.png", image(1), (100, 100))
+    # Using the first thumbnail makes the second the least recently used
+    os.utime(second, (0, 0))
+    assert cache.lookup("https://acme.test/a.png", (100, 100)) == first
+    cache.put("https://acme.test/c.png", image(2), (100, 100))
+
+    assert os.path.exists(first) and not os.path.exists(second)
+    assert cache.lookup("https://acme.test/b.png", (100, 100)) is None
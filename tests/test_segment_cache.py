@@ -0,0 +1,71 @@
+import os
+import pickle
+
+from app.services.segment_cache import SegmentCache
+from app.services.video_generator import VideoGenerator
+
+CONTENT = {'title': 'Acme', 'description': 'Tools', 'screenshots': {},
+           'features': [{'title': 'Fast', 'description': 'Fast builds', 'image': None}]}
+
+
+def preview_generator(tmp_path):
+    generator = VideoGenerator(profile='preview', render_workers=1, segment_cache=SegmentCache(str(tmp_path / "seg")))
+    generator.output_dir = str(tmp_path / "out")
+    os.makedirs(generator.output_dir, exist_ok=True)
+    encoded = []
+    encode = generator._encode_segment
+
+    def record(segment, segment_path):
+        encoded.append(segment.name)
+        return encode(segment, segment_path)
+
+    generator._encode_segment = record
+    return generator, encoded
+
+
+def test_generator_pickles_with_its_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator = VideoGenerator(render_workers=4, segment_cache=SegmentCache(str(tmp_path / "seg")),
+                               on_progress=lambda frames, total: None)
+    copy = pickle.loads(pickle.dumps(generator))
+    assert copy.segment_cache.cache_dir == str(tmp_path / "seg")
+    assert copy.on_progress is None
+    # The copy gets a lock of its own
+    with copy.segment_cache._lock:
+        pass
+
+
+def test_unchanged_render_reuses_segments_and_output_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator, encoded = preview_generator(tmp_path)
+    path = generator.generate(CONTENT)
+    assert os.path.basename(path).startswith('promo_')
+    assert encoded == ['intro', 'feature', 'outro']
+
+    # Same inputs: same file name, and every segment comes from the cache
+    os.remove(path)
+    encoded.clear()
+    assert generator.generate(dict(CONTENT)) == path
+    assert os.path.exists(path) and encoded == []
+
+    # Only the intro shows the description
+    changed = generator.generate(dict(CONTENT, description='Better tools'))
+    assert changed != path
+    assert encoded == ['intro']
+
+
+def test_least_recently_used_segments_are_evicted(tmp_path):
+    cache = SegmentCache(str(tmp_path / "seg"), max_bytes=250)
+
+    def put(key):
+        source = tmp_path / f"{key}.mp4"
+        source.write_bytes(b'x' * 100)
+        return cache.put(key, str(source))
+
+    for age, key in enumerate(['first', 'second']):
+        os.utime(put(key), (1000 + age, 1000 + age))
+    # A hit makes 'first' the most recently used
+    assert cache.get('first') is not None
+    put('third')
+    assert cache.get('second') is None
+    assert cache.get('first') is not None and cache.get('third') is not None
@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+
+from app.services.worker import PREWARM_MODULES, prewarm
+
+
+def test_api_import_leaves_heavy_modules_to_first_use():
+    code = (
+        "import json, sys, main; "
+        "print(json.dumps([m for m in ('selenium.webdriver', 'moviepy', 'numpy', 'PIL', 'bs4') if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_prewarm_imports_job_modules():
+    timings = prewarm(browser=False)
+    assert set(timings) == set(PREWARM_MODULES)
+    assert all(name in sys.modules for name in PREWARM_MODULES)
+
+
+def test_job_modules_leave_the_database_to_the_api():
+    code = (
+        "import json, sys, app.services.video_jobs; "
+        "print(json.dumps([m for m in ('sqlalchemy', 'app.db.database', 'app.services.status_writer', "
+        "'app.services.progress') if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,42 @@
+import asyncio
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.database import Base
+from app.db.models import Video, VideoStatus
+from app.services.status_writer import StatusWriter
+
+
+def test_updates_are_coalesced_and_final_status_sticks(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            indexes = await conn.run_sync(lambda sync: inspect(sync).get_indexes('videos'))
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            db.add_all([Video(website_url='https://a.test'), Video(website_url='https://b.test')])
+            await db.commit()
+
+        writer = StatusWriter(session_factory=sessions, interval=0)
+        writer.submit(1, {'status': 'scraping'})
+        writer.submit(1, {'status': 'rendering'})
+        writer.submit(1, {'progress': 0.5})
+        writer.submit(2, {'status': 'completed', 'output_path': 'output/b.mp4'})
+        writer.submit(2, {'status': 'rendering'})
+        await writer.flush()
+        # A final status already written is not replaced either
+        writer.submit(2, {'status': 'failed', 'error_message': 'late'})
+        await writer.flush()
+
+        async with sessions() as db:
+            first, second = await db.get(Video, 1), await db.get(Video, 2)
+        await engine.dispose()
+        return indexes, writer.stats(), first, second
+
+    indexes, stats, first, second = asyncio.run(run())
+    assert {tuple(index['column_names']) for index in indexes} >= {('status',), ('website_url',), ('created_at',)}
+    assert (first.status, first.progress) == (VideoStatus.RENDERING, 0.5)
+    assert (second.status, second.output_path, second.error_message) == (VideoStatus.COMPLETED, 'output/b.mp4', None)
+    assert stats['flushes'] == 2 and stats['updates'] == 6 and stats['pending'] == 0
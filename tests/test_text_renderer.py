@@ -0,0 +1,39 @@
+import numpy as np
+
+from app.services.text_renderer import TextRenderer, load_font, resolve_font_path, wrap_text
+
+FONT = resolve_font_path("DejaVuSans.ttf")
+
+
+def test_wrap_text_fills_lines_without_overflowing():
+    font = load_font(FONT, 20)
+    text = "Every metric your team cares about, on one screen\nAlerts"
+    lines = wrap_text(text, font, 200)
+    assert len(lines) > 2 and lines[-1] == "Alerts"
+    assert all(font.getlength(line) <= 200 for line in lines)
+    # Words are kept whole and in order when they fit
+    assert " ".join(lines[:-1]).split() == text.split("\n")[0].split()
+    # A greedy wrap never leaves room for the next word on a line
+    for line, following in zip(lines[:-2], lines[1:-1]):
+        assert font.getlength(f"{line} {following.split()[0]}") > 200
+
+
+def test_wrap_text_splits_words_longer_than_a_line():
+    font = load_font(FONT, 20)
+    word = "Supercalifragilisticexpialidocious" * 2
+    lines = wrap_text(f"a {word} b", font, 120)
+    assert lines[0] == "a"
+    assert "".join(lines[1:-1]) + lines[-1].split()[0] == word
+    assert all(font.getlength(line) <= 120 for line in lines)
+    assert lines[-1].endswith(" b")
+
+
+def test_rendered_text_is_cached_and_sized_to_width():
+    renderer = TextRenderer(cache_size=2)
+    image = renderer.render("Hello world, this wraps", FONT, 30, width=150)
+    assert image.shape[1] == 150 and image.shape[2] == 4
+    assert image[..., 3].any()
+    assert renderer.render("Hello world, this wraps", FONT, 30, width=150) is image
+    assert not image.flags.writeable
+    single = renderer.render("Hello", FONT, 30)
+    assert single.shape[0] < image.shape[0] and np.asarray(single).dtype == np.uint8
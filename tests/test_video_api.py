@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.endpoints import video as video_api
+from app.db.database import Base, fail_interrupted_jobs, get_db
+from app.db.models import Video, VideoStatus
+from app.services.job_queue import QueueFullError
+from app.services.status_writer import StatusWriter
+
+
+class StubQueue:
+    """Records submissions instead of running them"""
+
+    def __init__(self, full=False, reject=False):
+        self.full = full
+        self.reject = reject
+        self.submitted = []
+
+    def is_full(self):
+        return self.full
+
+    def has_room(self, bulk_jobs):
+        return not self.full
+
+    def submit(self, job_id, fn, *args, domain=''):
+        if self.reject:
+            raise QueueFullError("Job queue is full (0 jobs)")
+        self.submitted.append(job_id)
+
+    def submit_bulk(self, jobs):
+        if self.reject:
+            raise QueueFullError("Bulk backlog is full (0 jobs)")
+        self.submitted.extend(job_id for job_id, _, _, _ in jobs)
+
+    def cancel(self, job_id):
+        return False
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    asyncio.run(create())
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    queue = StubQueue()
+    monkeypatch.setattr(video_api, "get_job_queue", lambda: queue)
+    monkeypatch.setattr(video_api, "get_status_writer", lambda: StatusWriter(session_factory=sessions, interval=0))
+    app = FastAPI()
+    app.include_router(video_api.router)
+    app.dependency_overrides[get_db] = override_db
+    with TestClient(app) as client:
+        yield client, queue, sessions
+    asyncio.run(engine.dispose())
+
+
+def test_create_video_is_accepted_or_rejected_when_full(api):
+    client, queue, _ = api
+    response = client.post("/videos/", json={"website_url": "https://acme.test"})
+    assert response.status_code == 202 and response.json()["status"] == "queued"
+    assert queue.submitted == [response.json()["id"]]
+
+    queue.full = True
+    assert client.post("/videos/", json={"website_url": "https://acme.test"}).status_code == 429
+    queue.full, queue.reject = False, True
+    rejected = client.post("/videos/", json={"website_url": "https://acme.test"})
+    assert rejected.status_code == 429
+    assert client.get("/videos/2").json()["status"] == "failed"
+    assert client.post("/videos/", json={"website_url": "https://acme.test", "profile": "huge"}).status_code == 422
+
+
+def test_cancel_and_restart_recovery(api):
+    client, queue, sessions = api
+    video_id = client.post("/videos/", json={"website_url": "https://acme.test"}).json()["id"]
+    # Not in the queue (as after a restart): cancelled directly
+    assert client.post(f"/videos/{video_id}/cancel").json()["status"] == "cancelled"
+    assert client.post(f"/videos/{video_id}/cancel").status_code == 409
+    assert client.post("/videos/99/cancel").status_code == 404
+
+    async def interrupted():
+        async with sessions() as db:
+            db.add_all([Video(website_url="https://a.test", status=VideoStatus.RENDERING),
+                        Video(website_url="https://b.test", status=VideoStatus.COMPLETED)])
+            await db.commit()
+        return await fail_interrupted_jobs(sessions)
+
+    assert asyncio.run(interrupted()) == 1
+    stuck = client.get(f"/videos/{video_id + 1}").json()
+    assert (stuck["status"], stuck["error_message"]) == ("failed", "interrupted")
+    assert client.get(f"/videos/{video_id + 2}").json()["status"] == "completed"
+
+
+def test_batch_dedupes_normalized_urls_and_counts(api, monkeypatch):
+    client, queue, sessions = api
+    urls = ["https://acme.test/a", "HTTPS://Acme.test/a/", "https://acme.test/a?utm_source=ad",
+            "https://acme.test/b", "  ", "https://other.test/"]
+    response = client.post("/videos/batch", json={"urls": urls})
+    assert response.status_code == 202
+    batch = response.json()
+    assert (batch["total"], batch["duplicates"]) == (3, 3)
+    # The first spelling of each page is kept
+    assert [video["website_url"] for video in batch["videos"]] == [
+        "https://acme.test/a", "https://acme.test/b", "https://other.test/"]
+    assert queue.submitted == [video["id"] for video in batch["videos"]]
+
+    async def finish(video_id, status):
+        async with sessions() as db:
+            video = await db.get(Video, video_id)
+            video.status = status
+            await db.commit()
+    asyncio.run(finish(batch["videos"][0]["id"], VideoStatus.COMPLETED))
+    asyncio.run(finish(batch["videos"][1]["id"], VideoStatus.FAILED))
+
+    summary = client.get(f"/videos/batch/{batch['id']}").json()
+    assert summary["counts"] == {"queued": 1, "scraping": 0, "rendering": 0,
+                                 "completed": 1, "failed": 1, "cancelled": 0}
+    assert summary["progress"] == round(2 / 3, 4)
+    assert client.get("/videos/batch/99").status_code == 404
+
+
+def test_batch_limits_and_full_queue(api, monkeypatch):
+    client, queue, _ = api
+    monkeypatch.setattr(video_api.settings, "batch_max_urls", 2)
+    urls = ["https://a.test", "https://b.test", "https://c.test"]
+    assert client.post("/videos/batch", json={"urls": urls}).status_code == 422
+    assert client.post("/videos/batch", json={"urls": ["", " "]}).status_code == 422
+
+    queue.full = True
+    assert client.post("/videos/batch", json={"urls": urls[:2]}).status_code == 429
+    queue.full, queue.reject = False, True
+    response = client.post("/videos/batch", json={"urls": urls[:2]})
+    assert response.status_code == 429
+    # Nothing was queued, and every video of the rejected batch is marked failed
+    assert queue.submitted == []
+    batch = client.get("/videos/batch/1").json()
+    assert batch["counts"]["failed"] == 2 and batch["progress"] == 1.0
+    assert all(video["error_message"].startswith("Bulk backlog is full") for video in batch["videos"])
+
+
+def test_sessions_keep_loaded_objects_after_commit():
+    # A batch summary reads every video after the commit; expired objects would reload one by one
+    from app.db.database import SessionLocal
+    assert SessionLocal.kw["expire_on_commit"] is False